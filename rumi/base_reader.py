@@ -14,9 +14,107 @@ Base git history reader for translation monitoring
 
 
 import os
+import re
 import git
+import fnmatch
 
 from pathlib import Path
+from rumi.ignore import IGNORE_FILE, IgnoreMatcher
+
+
+# Ways to discover the target files
+DISCOVER_MODES = ("walk", "index", "tree")
+
+
+##########################################################################
+# Class PathIndex
+##########################################################################
+
+
+class PathIndex:
+    """
+    PathIndex keeps file paths relative to the repository, indexed both by the
+    relative path and by the basename, so that files can be looked up without
+    walking the repository again.
+
+    Parameters
+    ----------
+    paths: iterable, default: ()
+        Paths (relative to the repository) to add to the index.
+    """
+
+    def __init__(self, paths=()):
+        # {posix relative path: Path}
+        self.paths = {}
+        # {basename: set of Path}
+        self.names = {}
+
+        for path in paths:
+            self.add(path)
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __iter__(self):
+        return iter(self.paths.values())
+
+    def __contains__(self, path):
+        return Path(path).as_posix() in self.paths
+
+    def add(self, path):
+        """
+        Add a path to the index.
+        """
+        path = Path(path)
+        self.paths[path.as_posix()] = path
+        self.names.setdefault(path.name, set()).add(path)
+
+    def discard(self, path):
+        """
+        Remove a path from the index if it is present.
+        """
+        path = self.paths.pop(Path(path).as_posix(), None)
+        if path is None:
+            return
+
+        paths = self.names[path.name]
+        paths.discard(path)
+        if not paths:
+            del self.names[path.name]
+
+    def find(self, name):
+        """
+        Get the set of paths with the basename name.
+        """
+        return set(self.names.get(name, ()))
+
+    def match(self, pattern):
+        """
+        Get the set of paths matching a glob pattern. Patterns containing a "/"
+        are matched against the path relative to the repository, the others
+        against the basename.
+        """
+        pattern = pattern.replace(os.sep, "/")
+        has_magic = any(char in pattern for char in "*?[")
+
+        if "/" in pattern:
+            if not has_magic:
+                path = self.paths.get(Path(pattern).as_posix())
+                return {path} if path else set()
+
+            regex = re.compile(fnmatch.translate(pattern))
+            return {path for key, path in self.paths.items() if regex.match(key)}
+
+        if not has_magic:
+            return self.find(pattern)
+
+        regex = re.compile(fnmatch.translate(pattern))
+        return {
+            path
+            for name, paths in self.names.items()
+            if regex.match(name)
+            for path in paths
+        }
 
 
 ##########################################################################
@@ -42,6 +140,13 @@ class BaseReader:
     extensions: list, default: [".md"]
         List of extensions of the target files for translation monitoring. 
         Defult monitoring translation of the markdown files.
+    discover: string, choices: "walk", "index", "tree", default: "walk"
+        How to discover the target files: "walk" walks the content paths on disk,
+        "index" lists the files tracked in the git index, and "tree" lists the
+        files in the tree of the branch, with a single git command each.
+
+    Files and directories matching the gitignore-style rules of a .rumiignore file
+    at the root of the repository are skipped while discovering targets.
     """
 
     def __init__(
@@ -50,10 +155,26 @@ class BaseReader:
         branch="main",
         content_paths=["content"],
         extensions=[".md"],
+        discover="walk",
     ) -> None:
         self.repo_path = self.validate_repo_path(repo_path)
         self.branch = branch
+
+        if discover not in DISCOVER_MODES:
+            raise Exception("Please specify discover from {}".format(DISCOVER_MODES))
+        self.discover = discover
+        self.ignore = IgnoreMatcher.from_file(self.repo_path / IGNORE_FILE)
+        self.content_paths = content_paths.copy()
+        self.extensions = extensions.copy()
+
+        # Index of the files found while initializing the targets, which is
+        # extended to the whole repository the first time a file outside the
+        # content paths is looked up
+        self.files = PathIndex()
+        self.repo_indexed = False
+
         self.targets = self.init_targets(content_paths.copy(), extensions.copy())
+        self.target_index = PathIndex(self.targets)
 
     def init_targets(self, content_paths, extensions):
         """
@@ -77,18 +198,57 @@ class BaseReader:
         """
         target = []
 
-        for cp in content_paths:
+        for path in self.list_files(content_paths):
+            self.files.add(path)
+
+            # Check the extension, note you may want to use the more complex
+            # path.suffixes for multiple extensions e.g. myfile.en.md
+            if path.suffix in extensions:
+                target.append(path)
+        return set(target)
+
+    def list_files(self, paths):
+        """
+        List the files under paths from the root of the repository, as
+        discovered with self.discover.
+
+        Parameters
+        ----------
+        paths: list
+            Paths from the root of the repository, the whole repository is
+            listed if empty.
+
+        Returns
+        -------
+        files: generator
+            Paths of the files relative to the repo_path.
+        """
+        if self.discover == "walk":
+            return self.walk_files(paths)
+        return self.git_files(paths)
+
+    def walk_files(self, paths):
+        """
+        Walk the paths on disk to list the files, skipping hidden files and
+        directories.
+        """
+        for cp in paths or ["."]:
             # Resolve content directory to only walk it
             cp = self.repo_path.joinpath(cp)
 
             for root, dirs, files in os.walk(cp.resolve(), topdown=True):
-                # Ignore hidden directories, e.g. things like .git or .github
-                # In the future we could also use an argument to ignore
-                # specific directories like node_modules (or use .rumignore)
-                dirs[:] = [d for d in dirs if not self.is_hidden(d)]
-
                 # Convert the root to a Path for path operations
                 root = Path(root)
+                rel_root = root.relative_to(self.repo_path)
+
+                # Ignore hidden directories, e.g. things like .git or .github,
+                # and prune the directories ignored in .rumiignore
+                dirs[:] = [
+                    d
+                    for d in dirs
+                    if not self.is_hidden(d)
+                    and not self.ignore.match(rel_root / d, is_dir=True)
+                ]
 
                 for fname in files:
                     # Ignore hidden files
@@ -96,13 +256,86 @@ class BaseReader:
                         continue
 
                     # Create the Path from the file relative to the repo_path
-                    path = root.joinpath(fname).relative_to(self.repo_path)
+                    path = rel_root / fname
+                    if not self.ignore.match(path):
+                        yield path
 
-                    # Check the extension, note you may want to use the more complex
-                    # path.suffixes for multiple extensions e.g. myfile.en.md
-                    if path.suffix in extensions:
-                        target.append(path)
-        return set(target)
+    def git_files(self, paths):
+        """
+        List the files under the paths from the git index or from the tree of the
+        branch in a single git command, skipping hidden files and directories.
+        """
+        repo = git.Repo(self.repo_path)
+        pathspec = [Path(path).as_posix() for path in paths]
+
+        if self.discover == "index":
+            output = repo.git.ls_files("-z", "--", *pathspec)
+        else:
+            output = repo.git.ls_tree(
+                "-r", "-z", "--name-only", self.branch, "--", *pathspec
+            )
+
+        # Whether each directory is hidden or ignored, including its parents
+        skipped_dirs = {Path("."): False}
+
+        def is_skipped(directory):
+            if directory not in skipped_dirs:
+                skipped_dirs[directory] = (
+                    is_skipped(directory.parent)
+                    or self.is_hidden(directory.name)
+                    or self.ignore.match(directory, is_dir=True)
+                )
+            return skipped_dirs[directory]
+
+        for name in output.split("\0"):
+            if not name:
+                continue
+
+            path = Path(name)
+            if (
+                self.is_hidden(path.name)
+                or is_skipped(path.parent)
+                or self.ignore.match(path)
+            ):
+                continue
+            yield path
+
+    def get_blobs(self, paths):
+        """
+        Get the SHA of the blob of each file in the tree of the branch, with a
+        single git command.
+
+        Parameters
+        ----------
+        paths: iterable
+            Paths of the files from the root of the repository.
+
+        Returns
+        -------
+        blobs: dictionary
+            {posix path: blob SHA}, files that are not in the tree are left out.
+        """
+        wanted = {Path(path).as_posix() for path in paths}
+        if not wanted:
+            return {}
+
+        # List the whole tree rather than passing every path to git, which
+        # could exceed the command line length limit with many targets
+        repo = git.Repo(self.repo_path)
+        output = repo.git.ls_tree("-r", "-z", self.branch)
+
+        blobs = {}
+        for line in output.split("\0"):
+            if not line:
+                continue
+
+            # Each line is "<mode> <type> <sha>\t<path>"
+            info, name = line.split("\t", 1)
+            if name in wanted:
+                _, kind, sha = info.split(" ")
+                if kind == "blob":
+                    blobs[name] = sha
+        return blobs
 
     def is_hidden(self, basename):
         """
@@ -111,38 +344,93 @@ class BaseReader:
         """
         return basename.startswith(".") or basename.startswith("~")
 
-    def add_target(self, target_fname):
+    def index_repo(self):
         """
-        Look for the path to the target_fname and add it to self.targets.
+        List the files of the whole repository once and add them to self.files,
+        to look up target files outside of the content paths.
         """
-        for root, dirs, files in os.walk(self.repo_path.resolve(), topdown=True):
-            # Ignore hidden directories, e.g. things like .git or .github
-            dirs[:] = [d for d in dirs if not self.is_hidden(d)]
+        if self.repo_indexed:
+            return
 
-            # Convert the root to a Path for path operations
-            root = Path(root)
+        for path in self.list_files([]):
+            self.files.add(path)
 
-            for fname in files:
-                if fname == target_fname:
+        self.repo_indexed = True
 
-                    # Create the Path from the file relative to the repo_path
-                    path = root.joinpath(fname).relative_to(self.repo_path)
+    def add_target(self, target_fname):
+        """
+        Look for the path to the target_fname and add it to self.targets.
+        """
+        paths = self.files.find(target_fname)
+        if not paths and not self.repo_indexed:
+            self.index_repo()
+            paths = self.files.find(target_fname)
 
-                    self.targets.add(path)
-                    return
+        if not paths:
+            raise Exception("Please provide a valid file name")
 
-        raise Exception("Please provide a valid file name")
+        path = min(paths)
+        self.targets.add(path)
+        self.target_index.add(path)
 
     def del_target(self, target_fname):
         """
         Delete target_fname from self.targets.
         """
-        for path2file in self.targets:
-            basename = path2file.name
-            if target_fname == basename:
-                self.targets.remove(path2file)
-                return
-        raise Exception("Please provide a valid file name")
+        paths = self.target_index.find(target_fname)
+
+        if not paths:
+            raise Exception("Please provide a valid file name")
+
+        path = min(paths)
+        self.targets.discard(path)
+        self.target_index.discard(path)
+
+    def add_targets(self, patterns):
+        """
+        Add all files matching any of the file names or glob patterns to
+        self.targets, e.g. ["about.md", "content/*/blog/*.md"]. Patterns
+        containing a "/" are matched against the path from the repository root,
+        the others against the file name. The repository is walked at most once
+        per reader, later calls only look up the index.
+
+        Returns
+        -------
+        added: set
+            Set of the paths matching the patterns.
+        """
+        self.index_repo()
+
+        added = set()
+        for pattern in patterns:
+            paths = self.files.match(pattern)
+            if not paths:
+                raise Exception("Please provide a valid file name")
+            added.update(paths)
+
+        for path in added:
+            self.targets.add(path)
+            self.target_index.add(path)
+        return added
+
+    def del_targets(self, patterns):
+        """
+        Delete all targets matching any of the file names or glob patterns from
+        self.targets.
+
+        Returns
+        -------
+        deleted: set
+            Set of the deleted paths.
+        """
+        deleted = set()
+        for pattern in patterns:
+            deleted.update(self.target_index.match(pattern))
+
+        for path in deleted:
+            self.targets.discard(path)
+            self.target_index.discard(path)
+        return deleted
 
     def validate_repo_path(self, repo_path="."):
         """
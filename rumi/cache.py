@@ -15,10 +15,15 @@ Maintain caches for git history reader
 
 import os
 import pickle
+import tempfile
 
 from datetime import datetime as dt
 
 
+# Directory of the caches, relative to the working directory
+CACHE_DIR = "cache"
+
+
 ##########################################################################
 # Class Cache
 ##########################################################################
@@ -34,16 +39,20 @@ class Cache:
         Name of the repository for translation monitoring.
     which_rumi: string
         "file" or "msg" rumi.
+    version: int or None, default: None
+        Version of the layout of the cached commit history. Caches written with
+        another version are ignored, so that a reader changing its layout starts
+        over from the whole history instead of mixing old and new entries.
     """
 
-    def __init__(self, repo_name, which_rumi) -> None:
+    def __init__(self, repo_name, which_rumi, version=None) -> None:
         self.repo_name = repo_name
         self.which_rumi = which_rumi
+        self.version = version
         self.date_format = "%Y-%m-%d-%H-%M-%S"
-        self.cache_dir = os.path.join("cache", which_rumi, repo_name)
-
-        if not os.path.isdir(self.cache_dir):
-            os.makedirs(self.cache_dir)
+        self.cache_dir = os.path.join(CACHE_DIR, which_rumi, repo_name)
+        if version is not None:
+            self.cache_dir = os.path.join(self.cache_dir, "v{}".format(version))
         self.latest_date = self.get_latest()
 
     def get_latest(self):
@@ -55,7 +64,15 @@ class Cache:
         date: string
             Timestamp of the cache commit history in the format of "yyyy-mm-dd HH:MM:SS"
         """
-        cache_dates = os.listdir(self.cache_dir)
+        # Caches of other versions are kept in subdirectories
+        if os.path.isdir(self.cache_dir):
+            cache_dates = [
+                date
+                for date in os.listdir(self.cache_dir)
+                if os.path.isfile(os.path.join(self.cache_dir, date))
+            ]
+        else:
+            cache_dates = []
 
         if len(cache_dates) == 0:
             latest_date = "1900-1-1 00:00:00"
@@ -66,6 +83,20 @@ class Cache:
             latest_date = max(dates).strftime(self.date_format)
         return latest_date
 
+    def since(self):
+        """
+        Get the date of the latest cache in a format that git understands, to read
+        the git history since the latest cache.
+        Returns
+        -------
+        date: string
+            Timestamp of the latest cache in the format of "yyyy-mm-dd HH:MM:SS"
+        """
+        if not os.path.isfile(os.path.join(self.cache_dir, self.latest_date)):
+            return "1900-1-1 00:00:00"
+        date = dt.strptime(self.latest_date, self.date_format)
+        return date.strftime("%Y-%m-%d %H:%M:%S")
+
     def write_cache(self, commits):
         """
         Check if the current commit history is different from the latest cache. 
@@ -84,6 +115,9 @@ class Cache:
         else:
             old_commits = None
 
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
         date = dt.now().strftime(self.date_format)
         new_file = os.path.join(self.cache_dir, date)
         if old_commits == commits:
@@ -92,6 +126,9 @@ class Cache:
             with open(new_file, "wb") as f:
                 pickle.dump(commits, f)
 
+        # Later reads continue from the cache just written
+        self.latest_date = date
+
     def load_cache(self):
         """
         Load cached git history.
@@ -120,3 +157,73 @@ class Cache:
         else:
             commits = {}
         return commits
+
+
+##########################################################################
+# Class BlobCache
+##########################################################################
+
+
+class BlobCache:
+    """
+    Persistent mapping from git blob SHA to values computed from the content of
+    the blob. Blobs are content-addressed, so a value never needs to be
+    invalidated, and only blobs that were never seen have to be read again.
+
+    Parameters
+    ----------
+    repo_name: string
+        Name of the repository for translation monitoring.
+    which_rumi: string
+        "file" or "msg" rumi.
+    name: string
+        Name of the values stored in the cache, e.g. "frontmatter".
+    persist: bool, default: True
+        Whether to load and save the cache on disk, otherwise only keep it in
+        memory.
+    """
+
+    def __init__(self, repo_name, which_rumi, name, persist=True) -> None:
+        self.path = os.path.join(CACHE_DIR, "blobs", which_rumi, repo_name, name)
+        self.persist = persist
+        self.changed = False
+
+        if self.persist and os.path.isfile(self.path):
+            with open(self.path, "rb") as f:
+                self.values = pickle.load(f)
+        else:
+            self.values = {}
+
+    def __len__(self):
+        return len(self.values)
+
+    def __contains__(self, sha):
+        return sha in self.values
+
+    def __getitem__(self, sha):
+        return self.values[sha]
+
+    def __setitem__(self, sha, value):
+        self.values[sha] = value
+        self.changed = True
+
+    def get(self, sha, default=None):
+        return self.values.get(sha, default)
+
+    def save(self):
+        """
+        Write the cache to disk if it has changed since it was loaded.
+        """
+        if not self.persist or not self.changed:
+            return
+
+        dirname = os.path.dirname(self.path)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+
+        # Write to a temporary file first so that the cache is never truncated
+        fd, tmp_file = tempfile.mkstemp(dir=dirname)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(self.values, f)
+        os.replace(tmp_file, self.path)
+        self.changed = False
@@ -0,0 +1,181 @@
+# rumi.file_rumi.frontmatter
+# Front matter index for linking translations of hugo contents
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Front matter index for linking translations of hugo contents
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import io
+import re
+
+from rumi.cache import BlobCache
+
+
+# Closing delimiter of each front matter format, by opening delimiter
+DELIMITERS = {"---": "---", "+++": "+++", "{": "}"}
+
+# Number of bytes read at once from a blob
+CHUNK_SIZE = 8192
+
+# translationKey in YAML, TOML and JSON front matter
+TRANSLATION_KEY = re.compile(
+    r"""^\s*"?translationKey"?\s*[:=]\s*(.*?)\s*,?\s*$""", re.IGNORECASE
+)
+
+
+##########################################################################
+# Helper Functions
+##########################################################################
+
+
+def read_front_matter(lines):
+    """
+    Read the front matter of a content file, stopping at the end of the header
+    so that the body is never read.
+
+    Parameters
+    ----------
+    lines: iterable
+        Lines of the content file.
+
+    Returns
+    -------
+    header: list
+        Lines of the front matter without the delimiters, empty if the file has
+        no front matter.
+    """
+    lines = iter(lines)
+    first = next(lines, "").strip()
+    if first not in DELIMITERS:
+        return []
+
+    closing = DELIMITERS[first]
+    header = []
+    for line in lines:
+        if line.strip() == closing:
+            return header
+        header.append(line)
+
+    # Unterminated front matter
+    return []
+
+
+def parse_translation_key(header):
+    """
+    Get the translationKey from the lines of a front matter, None if not set.
+    """
+    for line in header:
+        matched = TRANSLATION_KEY.match(line)
+        if matched:
+            key = matched.group(1)
+            if len(key) > 1 and key[0] == key[-1] and key[0] in "\"'":
+                key = key[1:-1]
+            return key or None
+    return None
+
+
+##########################################################################
+# Class BlobStream
+##########################################################################
+
+
+class BlobStream(io.RawIOBase):
+    """
+    Read-only file object over the stream of a blob from the git object
+    database, so that it can be decoded with io.TextIOWrapper.
+
+    Parameters
+    ----------
+    stream: object
+        Stream of the blob from repo.odb.stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        # git cat-file writes the next blob after this one, so the unread rest
+        # of the blob is skipped chunk by chunk
+        if not self.closed:
+            while self.stream.read(CHUNK_SIZE):
+                pass
+        super().close()
+
+
+##########################################################################
+# Class FrontMatterIndex
+##########################################################################
+
+
+class FrontMatterIndex:
+    """
+    FrontMatterIndex gets the translationKey of content files from their front
+    matter. Keys are cached by blob SHA, so only the files whose blobs changed
+    since the previous run have their header read.
+
+    Parameters
+    ----------
+    repo: object
+        Gitpython Repo object to read the blobs from.
+    cache: BlobCache or None, default: None
+        Cache of the translationKey by blob SHA. If not specified, the keys are
+        only cached in memory.
+    """
+
+    def __init__(self, repo, cache=None):
+        self.repo = repo
+        self.cache = (
+            cache
+            if cache is not None
+            else BlobCache("", "file", "frontmatter", persist=False)
+        )
+
+    def translation_key(self, sha):
+        """
+        Get the translationKey of a blob, None if not set.
+        """
+        if sha not in self.cache:
+            stream = BlobStream(self.repo.odb.stream(bytes.fromhex(sha)))
+            # Lines are decoded lazily, only up to the end of the front matter
+            with io.TextIOWrapper(stream, encoding="utf-8", errors="replace") as lines:
+                self.cache[sha] = parse_translation_key(read_front_matter(lines))
+        return self.cache[sha]
+
+    def translation_keys(self, blobs):
+        """
+        Get the translationKey of each file.
+
+        Parameters
+        ----------
+        blobs: dictionary
+            {path: blob SHA}
+
+        Returns
+        -------
+        keys: dictionary
+            {path: translationKey}, files without translationKey are left out.
+        """
+        keys = {}
+        for path, sha in blobs.items():
+            key = self.translation_key(sha)
+            if key is not None:
+                keys[path] = key
+
+        self.cache.save()
+        return keys
@@ -0,0 +1,193 @@
+# rumi.file_rumi.matrix
+# Vectorized translation status engine for file-based translation monitoring
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Vectorized translation status engine for file-based translation monitoring
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+# Status codes, in the order of their index in the status matrix
+STATUSES = ("open", "updated", "completed", "source")
+OPEN, UPDATED, COMPLETED, SOURCE = range(len(STATUSES))
+
+
+##########################################################################
+# Class StatusMatrix
+##########################################################################
+
+
+class StatusMatrix:
+    """
+    StatusMatrix lays out the first and last commit times of the commit history
+    as dense basename x locale arrays, so that the sources, statuses and stats of
+    all the files are computed with whole array operations instead of nested
+    loops over the commit dictionary. Locales without commit history of a
+    basename have a first commit time of inf and a last commit time of nan.
+
+    Parameters
+    ----------
+    commits: dictionary
+        Commit history of the repository organized by
+        {
+            "basename": {
+                "locale": {
+                    "filename": name of the target file,
+                    "ft": timestamp of the first commit (float),
+                    "lt": timestamp of the last commit (float),
+                    "history": {
+                        timestamp (float): [#additions, #deletions, #lines]
+                    }
+                }
+            }
+        }
+    src_lang: string, default: "en"
+        Default source language, used when several locales of a basename have the
+        same first commit time.
+    langs: iterable, default: ()
+        Locales to monitor in addition to the ones in the commit history.
+    """
+
+    def __init__(self, commits, src_lang="en", langs=()):
+        if np is None:
+            raise Exception("Please install numpy to use the vectorized status engine")
+
+        self.src_lang = src_lang
+        self.basenames = list(commits)
+        self.rows = {name: idx for idx, name in enumerate(self.basenames)}
+
+        columns = dict.fromkeys(langs)
+        for files in commits.values():
+            columns.update(dict.fromkeys(files))
+        self.locales = list(columns)
+        self.columns = {lang: idx for idx, lang in enumerate(self.locales)}
+
+        rows, cols, fts, lts = [], [], [], []
+        for row, files in enumerate(commits.values()):
+            for lang, entry in files.items():
+                # Skip locales without commit history, e.g. {} or {"status": "open"}
+                if "ft" not in entry:
+                    continue
+                rows.append(row)
+                cols.append(self.columns[lang])
+                fts.append(entry["ft"])
+                lts.append(entry["lt"])
+
+        shape = (len(self.basenames), len(self.locales))
+        self.ft = np.full(shape, np.inf)
+        self.lt = np.full(shape, np.nan)
+        self.ft[rows, cols] = fts
+        self.lt[rows, cols] = lts
+
+        self.sources = self.get_sources()
+        self.codes = self.get_status(self.sources)
+
+    def get_sources(self):
+        """
+        Get the column of the source locale of each basename: the locale with the
+        earliest first commit time, or the default source language on a tie.
+
+        Returns
+        -------
+        sources: array
+            Column index of the source locale for each row.
+        """
+        if self.ft.size == 0:
+            return np.zeros(len(self.basenames), dtype=np.intp)
+
+        sources = self.ft.argmin(axis=1)
+
+        if self.src_lang in self.columns:
+            col = self.columns[self.src_lang]
+            tie = self.ft[:, col] == self.ft.min(axis=1)
+            sources = np.where(tie, col, sources)
+
+        return sources
+
+    def get_status(self, sources):
+        """
+        Get the status code of each basename and locale: OPEN without commit
+        history, COMPLETED if the last commit time is not earlier than the one of
+        the source, UPDATED otherwise, and SOURCE for the source locale.
+
+        Parameters
+        ----------
+        sources: array
+            Column index of the source locale for each row.
+
+        Returns
+        -------
+        codes: array
+            basename x locale array of status codes.
+        """
+        rows = np.arange(len(self.basenames))
+        src_lt = self.lt[rows, sources][:, np.newaxis]
+
+        codes = np.where(self.lt >= src_lt, COMPLETED, UPDATED).astype(np.int8)
+        codes[np.isnan(self.lt)] = OPEN
+        codes[rows, sources] = SOURCE
+        return codes
+
+    def get_stats(self):
+        """
+        Count the status codes of each locale.
+
+        Returns
+        -------
+        stats: dictionary
+            {
+                locale: {
+                    "open": int,
+                    "updated": int,
+                    "completed": int,
+                    "total": int
+                }
+            }
+        """
+        n_status = len(STATUSES)
+        offsets = np.arange(len(self.locales)) * n_status
+        counts = np.bincount(
+            (self.codes + offsets).ravel(), minlength=len(offsets) * n_status
+        ).reshape(-1, n_status)
+
+        stats = {}
+        for lang, count in zip(self.locales, counts.tolist()):
+            stats[lang] = {
+                "open": count[OPEN],
+                "updated": count[UPDATED],
+                "completed": count[COMPLETED],
+                "total": count[OPEN] + count[UPDATED] + count[COMPLETED],
+            }
+        return stats
+
+    def status_of(self, base_name, lang):
+        """
+        Get the status of a locale of a basename.
+        """
+        code = self.codes[self.rows[base_name], self.columns[lang]]
+        return STATUSES[code]
+
+    def apply(self, commits):
+        """
+        Write the status of each locale into the commit dictionary, adding the
+        monitored locales missing from a basename with status "open".
+        """
+        for row, files in enumerate(commits.values()):
+            codes = self.codes[row].tolist()
+            for lang, col in self.columns.items():
+                if lang not in files:
+                    files[lang] = {}
+                files[lang]["status"] = STATUSES[codes[col]]
+        return commits
@@ -13,12 +13,20 @@ Git history reader for file-based translation monitoring
 ##########################################################################
 
 
+import os
 import re
+import sys
 
 from pathlib import Path
+from itertools import chain
+from functools import lru_cache
 from datetime import datetime
-from rumi.cache import Cache
+from rumi.cache import BlobCache, Cache
+from rumi.metrics import MetricsStore, count_lines
 from rumi.base_reader import BaseReader
+from rumi.records import encode, require_numpy, to_records
+from rumi.file_rumi.matrix import STATUSES, StatusMatrix
+from rumi.file_rumi.frontmatter import FrontMatterIndex
 
 # Language Codes
 ALL_LANGS = {
@@ -208,6 +216,20 @@ ALL_LANGS = {
     "zu",
 }
 
+# BCP-47 script (e.g. zh-Hans) and region (e.g. pt-BR, es-419) subtags that may
+# follow a language code of ALL_LANGS
+SUBTAGS = r"(?:[-_][A-Za-z]{4})?(?:[-_](?:[A-Za-z]{2}|[0-9]{3}))?"
+
+# Maximum number of file names with memoized basename and language
+PARSE_CACHE_SIZE = 65536
+
+# Engines to compute the sources and statuses of the commit history
+ENGINES = ("python", "numpy")
+
+# Version of the cached commit history, bumped when the basename keys change,
+# e.g. to paths relative to the content root with the locale removed
+CACHE_VERSION = 2
+
 
 ##########################################################################
 # Class FileReader
@@ -231,8 +253,11 @@ class FileReader(BaseReader):
     extensions: list, default: [".md"]
         List of extensions of the target files for translation monitoring. 
         Defult monitoring translation of the markdown files.
-    pattern: string, choices: "folder/", ".lang"
+    pattern: string or dictionary, choices: "folder/", ".lang"
         Two types of patterns in which the static site repository is organized.
+        A dictionary sets the pattern of each content path, e.g. {"content":
+        "folder/", "i18n": ".lang"}, and files outside of these paths use
+        "folder/".
     langs: string, default: ""
         Language codes joint by a white space as specified by the user. If not
         specified, FileReader will try to get languages from the filenames in the
@@ -241,6 +266,18 @@ class FileReader(BaseReader):
         Default source language set by user.
     use_cache: bool, default: True
         Whether to use cached commit history datastructure. 
+    discover: string, choices: "walk", "index", "tree", default: "walk"
+        How to discover the target files: "walk" walks the content paths on disk,
+        "index" lists the files tracked in the git index, and "tree" lists the
+        files in the tree of the branch.
+    translation_key: bool, default: False
+        Whether to link the locales of a content by the hugo translationKey in
+        the front matter of the files. Files without translationKey are linked
+        by their basename.
+    engine: string, choices: "python", "numpy", default: "python"
+        How to compute the sources and statuses: "python" loops over the commit
+        dictionary, and "numpy" uses the vectorized StatusMatrix, which requires
+        numpy.
     """
 
     def __init__(
@@ -253,12 +290,16 @@ class FileReader(BaseReader):
         pattern="folder/",
         src_lang="en",
         use_cache=True,
+        discover="walk",
+        translation_key=False,
+        engine="python",
     ):
         super().__init__(
             content_paths=content_paths.copy(),
             extensions=extensions.copy(),
             repo_path=repo_path,
             branch=branch,
+            discover=discover,
         )
 
         self.pattern = pattern
@@ -270,16 +311,77 @@ class FileReader(BaseReader):
         # it's consistent with filenames in their repository. If not specified,
         # pool will be set with lower case language codes.
         self.lang_pool = set(langs.split(" ")) if langs else ALL_LANGS
+        # The pool is compiled into a single regular expression, which also
+        # accepts BCP-47 tags such as pt-BR or zh-Hans if not specified
+        lang_regex = self.compile_langs(langs.split(" ") if langs else [])
+        # In "folder/", lang (locale) is the first directory name that matches
+        self.folder_regex = re.compile(r"(?:^|/)({})/".format(lang_regex))
+        # In ".lang", lang (locale) is the first extension that matches
+        self.ext_regex = re.compile(r"\.({})(?=\.|$)".format(lang_regex))
+        self._parse_base_lang = lru_cache(maxsize=PARSE_CACHE_SIZE)(
+            self.match_base_lang
+        )
+
+        # Pattern of the files in each content root
+        if isinstance(pattern, dict):
+            self.patterns = {
+                self.normalize_root(cp): pat for cp, pat in pattern.items()
+            }
+            self.default_pattern = "folder/"
+        else:
+            self.patterns = {}
+            self.default_pattern = pattern
+
+        # Content roots, longest first to find the innermost root of a file
+        roots = {self.normalize_root(cp) for cp in self.content_paths}
+        self.content_roots = sorted(
+            (roots | set(self.patterns)) - {""}, key=len, reverse=True
+        )
+        # Content identity index of the parsed files, {path: (basename, lang)}
+        self.identities = {}
+        # Commit history of the latest parse_history
+        self.commits = {}
         # Specified target languages
         # self.langs is needed to keep track of the use specified languages so
         # that for a totally untranslated repository, with no languages can be
         # detected, rumi can still display translation status in each target language.
         self.langs = langs.split(" ") if langs else []
+        # Registry of all the locales seen so far, kept across parse_history runs
+        # as an ordered set so that only new locales need to be filled
+        self.locales = dict.fromkeys(self.langs)
 
         self.use_cache = use_cache
         if self.use_cache:
             repo_name = self.repo_path.stem
-            self.cache = Cache(repo_name=repo_name, which_rumi="file")
+            self.cache = Cache(
+                repo_name=repo_name, which_rumi="file", version=CACHE_VERSION
+            )
+
+        self.translation_key = translation_key
+
+        if engine not in ENGINES:
+            raise Exception("Please specify engine from {}".format(", ".join(ENGINES)))
+        self.engine = engine
+        # Status matrix of the latest parse_history with the "numpy" engine
+        self.matrix = None
+        # Per-locale stats of the latest parse_history, updated by deltas
+        self.stats = None
+        # The translationKey of each blob, only persisted when using cache
+        self.frontmatter_cache = BlobCache(
+            repo_name=self.repo_path.stem,
+            which_rumi="file",
+            name="frontmatter",
+            persist=self.use_cache,
+        )
+        # Lines, words and bytes of each blob, shared with the reporter
+        self.metrics = MetricsStore(
+            BlobCache(
+                repo_name=self.repo_path.stem,
+                which_rumi="file",
+                name="metrics",
+                persist=self.use_cache,
+            )
+        )
 
     def process_rename(self, filename):
         """
@@ -350,13 +452,39 @@ class FileReader(BaseReader):
             commits = self.cache.load_cache()
             iter = reversed(
                 list(
-                    repo.iter_commits(paths=self.targets, since=self.cache.latest_date)
+                    repo.iter_commits(paths=self.targets, since=self.cache.since())
                 )
             )
         else:
             commits = {}
             iter = reversed(list(repo.iter_commits(paths=self.targets)))
 
+        # Link the locales of a content by translationKey instead of basename
+        # Blob SHA of each target, to look up metrics and front matter by blob
+        blobs = self.get_blobs(self.targets)
+        self.metrics.set_blobs(repo, blobs)
+
+        if self.translation_key:
+            index = FrontMatterIndex(repo, cache=self.frontmatter_cache)
+            keys = index.translation_keys(blobs)
+        else:
+            keys = {}
+        self.set_identities(keys)
+
+        # Stats of the cached history, only counted in full on the first run
+        if self.use_cache and self.stats is not None:
+            stats = self.stats
+        else:
+            stats = self.count_stats({}, commits)
+
+        # Basenames touched by the new commits
+        dirty = set()
+
+        # Every cached basename has all the cached locales after set_langs
+        for files in commits.values():
+            self.register_langs(files)
+            break
+
         for commit in iter:
 
             timestamp = float(datetime.timestamp(commit.authored_datetime))
@@ -378,20 +506,26 @@ class FileReader(BaseReader):
 
                 add = commit.stats.files[file]["insertions"]
                 delete = commit.stats.files[file]["deletions"]
-                # Get total number of lines of files directly from the file
-                with open(self.repo_path / fname, "r+") as f:
-                    n_lines = len(f.readlines())
+                n_lines = self.count_lines(fname)
 
                 base_name, lang = self.parse_base_lang(fname)
 
                 if not base_name:
                     raise Exception("Invalid target filename")
 
+                base_name = keys.get(Path(fname).as_posix(), base_name)
+
                 if base_name not in commits:
                     commits[base_name] = {}
 
+                # Remove the statuses of the basename from the stats before update
+                if base_name not in dirty:
+                    self.count_stats(stats, {base_name: commits[base_name]}, -1)
+                    dirty.add(base_name)
+
                 # Track the first and last commit time for each locale of the basefile
-                if lang in commits[base_name]:
+                # Cached locales without commit history only have a status
+                if "ft" in commits[base_name].get(lang, {}):
                     if timestamp < commits[base_name][lang]["ft"]:
                         commits[base_name][lang]["ft"] = timestamp
                     elif timestamp > commits[base_name][lang]["lt"]:
@@ -410,25 +544,189 @@ class FileReader(BaseReader):
                         "history": {timestamp: [add, delete, n_lines]},  # handle total
                     }
 
-        # Determine which locale is the source for each basename
-        sources = self.get_sources(commits)
+        if self.engine == "numpy":
+            # Compute sources and statuses over the basename x locale matrix
+            self.matrix = StatusMatrix(commits, self.src_lang, self.locales)
+            self.matrix.apply(commits)
+            stats = self.matrix.get_stats()
+        else:
+            # Ensure each basename has the same set of locales, basenames given
+            # a new locale need their statuses to be set as well
+            for base_name in self.set_langs(commits, dirty) - dirty:
+                self.count_stats(stats, {base_name: commits[base_name]}, -1)
+                dirty.add(base_name)
+
+            # Determine which locale is the source for each changed basename
+            sources = self.get_sources(commits, dirty)
 
-        # Ensure each basename has the same set of locales
-        self.set_langs(commits)
+            # Set translation status for each locale of each changed basename
+            self.set_status(commits, sources)
 
-        # Set translation status for each locale of each basename
-        self.set_status(commits, sources)
+            self.count_stats(stats, {b: commits[b] for b in dirty})
 
+        self.metrics.save()
         if self.use_cache:
             self.cache.write_cache(commits)
 
+        self.commits = commits
+        self.stats = stats
         return commits
 
+    def set_identities(self, keys):
+        """
+        Index the content identity of every target, including those that the
+        history walk does not touch, e.g. on a cached run without new commits.
+
+        Parameters
+        ----------
+        keys: dictionary
+            {path: translationKey} of the targets linked by front matter.
+        """
+        self.identities = {}
+        for target in self.targets:
+            path = Path(target).as_posix()
+            try:
+                base_name, lang = self.parse_base_lang(path)
+            except Exception:
+                # Committed files that can not be parsed fail in the history walk
+                continue
+            self.identities[path] = (keys.get(path, base_name), lang)
+
+    def count_lines(self, fname):
+        """
+        Get the total number of lines of a target file, from the metrics of its
+        blob if known, otherwise directly from the file.
+        """
+        metrics = self.metrics.get(fname)
+        if metrics is not None:
+            return metrics["lines"]
+
+        return count_lines((self.repo_path / fname).read_bytes())
+
+    def status_of(self, path):
+        """
+        Look up the translation status of a target file in the commit history of
+        the latest parse_history.
+
+        Parameters
+        ----------
+        path: string or Path object
+            Path to the file from the root of the repository.
+
+        Returns
+        -------
+        status: string
+            "open", "updated", "completed", or "source".
+        """
+        key = Path(path).as_posix()
+        base_name, lang = self.identities.get(key) or self.parse_base_lang(key)
+
+        try:
+            return self.commits[base_name][lang]["status"]
+        except KeyError:
+            raise Exception("Unable to find the status of {}".format(path))
+
+    def export_history(self, commits=None):
+        """
+        Export the commit history as a NumPy structured array with one row per
+        commit of each file, for vectorized analysis. Basenames, locales and
+        statuses are stored as categorical codes into lookup tables.
+
+        Parameters
+        ----------
+        commits: dictionary or None, default: None
+            Commit history organized as returned by parse_history. If not
+            specified, the commit history of the latest parse_history is used.
+
+        Returns
+        -------
+        records: structured array
+            Fields "basename" (int32), "locale" (int32), "status" (int32),
+            "timestamp" (float64), "additions", "deletions" and "lines" (int64).
+        tables: dictionary
+            {"basename": [...], "locale": [...], "status": [...]}, the value of
+            each code of the categorical fields.
+        """
+        np = require_numpy()
+        commits = self.commits if commits is None else commits
+
+        # Locales with commit history, in the order of the commit dictionary
+        entries = [
+            (base_name, lang, entry)
+            for base_name, files in commits.items()
+            for lang, entry in files.items()
+            if entry.get("history")
+        ]
+        histories = [entry["history"] for _, _, entry in entries]
+
+        n_entries = len(entries)
+        counts = np.fromiter(map(len, histories), dtype=np.intp, count=n_entries)
+        size = int(counts.sum())
+
+        base_table, lang_table = {}, {}
+        basenames = encode((b for b, _, _ in entries), base_table, n_entries)
+        locales = encode((lang for _, lang, _ in entries), lang_table, n_entries)
+        statuses = np.fromiter(
+            (STATUSES.index(entry.get("status", "open")) for _, _, entry in entries),
+            dtype=np.int32,
+            count=n_entries,
+        )
+        timestamps = np.fromiter(chain.from_iterable(histories), np.float64, size)
+        # [#additions, #deletions, #lines] of each commit
+        changes = np.fromiter(
+            chain.from_iterable(chain.from_iterable(h.values() for h in histories)),
+            dtype=np.int64,
+            count=size * 3,
+        ).reshape(size, 3)
+
+        records = to_records(
+            {
+                "basename": np.repeat(basenames, counts),
+                "locale": np.repeat(locales, counts),
+                "status": np.repeat(statuses, counts),
+                "timestamp": timestamps,
+                "additions": changes[:, 0],
+                "deletions": changes[:, 1],
+                "lines": changes[:, 2],
+            }
+        )
+        tables = {
+            "basename": list(base_table),
+            "locale": list(lang_table),
+            "status": list(STATUSES),
+        }
+        return records, tables
+
+    def normalize_root(self, content_path):
+        """
+        Normalize a content path into a posix path without leading "./" and
+        trailing "/", "" for the root of the repository.
+        """
+        root = Path(content_path).as_posix().strip("/")
+        return "" if root == "." else root
+
+    def compile_langs(self, langs):
+        """
+        Compile the language pool into a regular expression matching a language
+        code, either one of the specified langs or one of ALL_LANGS optionally
+        followed by BCP-47 script and region subtags.
+        """
+        if langs:
+            # Longest first so that e.g. pt-BR is preferred over pt
+            codes = sorted(set(langs), key=lambda lang: (-len(lang), lang))
+            return "(?:{})".format("|".join(re.escape(lang) for lang in codes))
+
+        return "(?:{}){}".format("|".join(sorted(ALL_LANGS)), SUBTAGS)
+
     def parse_base_lang(self, file_name):
         """
         Given a full path/to/file/filename, parse the basename and langauge with
         consideration of the two types of repository organization patterns: "folder/"
-        and ".lang".
+        and ".lang". The basename is the path of the file relative to its content
+        path with the language removed, e.g. "posts/index.md" for both
+        "content/en/posts/index.md" and "content/posts/index.en.md", so that page
+        bundles with the same file name are kept apart. The result is memoized
+        for the most recent file names.
         Parameters
         ----------
         file_name: string
@@ -440,35 +738,48 @@ class FileReader(BaseReader):
         lang: string
             Code of language used in the file.
         """
-        file_name = Path(file_name)
+        return self._parse_base_lang(os.fspath(file_name))
 
-        if self.pattern == "folder/":
-            # In this pattern, lang (locale) is one of the directory name
-            for dir_name in file_name.parts:
-                if dir_name in self.lang_pool:
-                    lang = dir_name
-                    base_name = file_name.name
-                    break
-            if not "lang" in locals() or lang not in self.lang_pool:
+    def match_base_lang(self, file_name):
+        """
+        Parse the basename and language of a file name with the compiled language
+        pool, see parse_base_lang.
+        """
+        path = file_name.replace(os.sep, "/")
+
+        # The basename is relative to the innermost content root of the file,
+        # which also sets the pattern of the file
+        start = 0
+        pattern = self.default_pattern
+        for root in self.content_roots:
+            if path.startswith(root + "/"):
+                start = len(root) + 1
+                pattern = self.patterns.get(root, self.default_pattern)
+                break
+
+        if pattern == "folder/":
+            matched = self.folder_regex.search(path)
+            if not matched:
                 raise Exception("Unable to parse file {}".format(file_name))
 
-        elif self.pattern == ".lang":
-            # In this pattern, lang (locale) is one of the extensions
-            extensions = file_name.suffixes
-
-            for ext in extensions:
-
-                if ext[1:] in self.lang_pool:
-                    lang = ext[1:]
-                    break
-
-            if not "lang" in locals() or not lang in self.lang_pool:
+            lang = matched.group(1)
+            # Remove the locale directory unless it is part of the content root
+            if matched.start(1) >= start:
+                base_name = path[start:matched.start(1)] + path[matched.end():]
+            else:
+                base_name = path[start:]
+
+        elif pattern == ".lang":
+            name_start = path.rfind("/") + 1
+            matched = self.ext_regex.search(path, name_start)
+            if not matched:
                 raise Exception("Unable to parse file {}".format(file_name))
 
-            base_name = file_name.name.replace(ext, "")
+            lang = matched.group(1)
+            base_name = path[start:matched.start()] + path[matched.end():]
         else:
             raise Exception("Unable to parse file {}".format(file_name))
-        return base_name, lang
+        return sys.intern(base_name), sys.intern(lang)
 
     def get_langs(self, commits):
         """
@@ -481,32 +792,73 @@ class FileReader(BaseReader):
         langs: set
             Set of all language codes contained and monitored in the repository.
         """
-
-        langs = self.langs
         for base_file in commits:
-            langs.extend(list(commits[base_file].keys()))
+            self.register_langs(commits[base_file])
 
-        return set(langs)
+        return set(self.locales)
 
-    def set_langs(self, commits):
+    def register_langs(self, langs):
+        """
+        Add the locales first seen to the registry of locales.
+
+        Returns
+        -------
+        new_langs: list
+            Locales that were not in the registry.
+        """
+        new_langs = [lang for lang in dict.fromkeys(langs) if lang not in self.locales]
+        self.locales.update(dict.fromkeys(new_langs))
+        return new_langs
+
+    def set_langs(self, commits, basenames=None):
         """
         Parse through the commit dictionary and set all locales for each basefile.
+        If basenames are given, only these basenames are checked for missing
+        locales, and the other basenames are only given the locales first seen in
+        these basenames.
+
+        Returns
+        -------
+        filled: set
+            Basenames that were missing a locale.
         """
-        langs = self.get_langs(commits)
+        if basenames is None:
+            self.get_langs(commits)
+            basenames = commits
+            new_langs = []
+        else:
+            new_langs = []
+            for basefile in basenames:
+                new_langs.extend(self.register_langs(commits[basefile]))
 
-        for basefile in commits:
+        filled = set()
+        for basefile in basenames:
             files = commits[basefile]
 
-            for lang in langs:
+            for lang in self.locales:
                 if lang not in files:
                     files[lang] = {}
+                    filled.add(basefile)
+
+        # Locales first seen are added to every basename
+        if new_langs:
+            for basefile in commits:
+                files = commits[basefile]
+
+                for lang in new_langs:
+                    if lang not in files:
+                        files[lang] = {}
+                        filled.add(basefile)
 
-    def get_sources(self, commits):
+        return filled
+
+    def get_sources(self, commits, basenames=None):
         """
-        Parse through the commit dictionary and set all source files.
+        Parse through the commit dictionary and set all source files, or only the
+        source files of the given basenames.
         """
         sources = {}
-        for base_file in commits:
+        for base_file in commits if basenames is None else basenames:
 
             st = float("inf")
 
@@ -514,6 +866,10 @@ class FileReader(BaseReader):
 
                 file_dict = commits[base_file][lang]
 
+                # Locales without commit history cannot be the source
+                if "ft" not in file_dict:
+                    continue
+
                 if file_dict["ft"] < st:
                     src_lang = lang
                     st = file_dict["ft"]
@@ -527,10 +883,51 @@ class FileReader(BaseReader):
 
         return sources
 
+    def count_stats(self, stats, commits, sign=1):
+        """
+        Add the statuses of the commit history to the per-locale stats, or remove
+        them with sign=-1, so that stats are updated by the changed basenames only.
+
+        Parameters
+        ----------
+        stats: dictionary
+            {
+                locale: {
+                    "open": int,
+                    "updated": int,
+                    "completed": int,
+                    "total": int
+                }
+            }
+        commits: dictionary
+            Commit history of the basenames to count.
+        sign: int, default: 1
+            1 to add the statuses and -1 to remove them.
+
+        Returns
+        -------
+        stats: dictionary
+            Updated stats.
+        """
+        for files in commits.values():
+            for lang, file_dict in files.items():
+
+                if lang not in stats:
+                    stats[lang] = {"open": 0, "updated": 0, "completed": 0, "total": 0}
+
+                status = file_dict.get("status", "source")
+
+                if status != "source":
+                    stats[lang]["total"] += sign
+                    stats[lang][status] += sign
+
+        return stats
+
     def set_status(self, commits, sources):
         """
         Set the translation status of source, open (hasn't been translated), 
-        updated (has been changed since translation), and completed.
+        updated (has been changed since translation), and completed, for each
+        basename in sources.
         Parameters
         ----------
         commits: dictionary
@@ -569,7 +966,7 @@ class FileReader(BaseReader):
             }
         """
 
-        for basefile in commits:
+        for basefile in sources:
 
             src_lang = sources[basefile]
             files = commits[basefile]
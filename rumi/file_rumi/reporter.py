@@ -14,8 +14,49 @@ Reporter for file-based translation monitoring
 
 
 import json
+import heapq
+
+from typing import NamedTuple
 from pathlib import Path
-from tabulate import tabulate
+from concurrent.futures import ThreadPoolExecutor
+from rumi.metrics import count_words
+from rumi.render import print_table
+from rumi.writers import stats_rows, write_rows
+
+
+# Fields of the Detail records to pick the top rows of the details by
+SORT_KEYS = ("wc", "pu")
+
+
+##########################################################################
+# Detail Records
+##########################################################################
+
+
+class Detail(NamedTuple):
+    """
+    Translation need of a target file, with numeric word count and percentages
+    that are only formatted when printed.
+    """
+
+    basefile: str
+    status: str
+    src_lang: str
+    wc: int
+    tgt_lang: str
+    # Percent completed and percent updated, as fractions of the source file
+    pc: float
+    pu: float
+
+
+def format_pct(value):
+    """
+    Format a fraction as a percentage rounded to one decimal, e.g. "50.0%", with
+    zero as "0%".
+    """
+    if value == 0:
+        return "0%"
+    return str(round(value * 100, 1)) + "%"
 
 
 ##########################################################################
@@ -58,14 +99,20 @@ class FileReporter:
         Language code of the target language (language to translate contents
         into) to be monitored. If not specified, all target language will
         be monitored.
+
+    metrics: MetricsStore or None, default: None
+        Metrics of the target files by blob SHA, e.g. reader.metrics. If
+        specified, word counts are looked up by blob instead of reading the
+        files.
     """
 
-    def __init__(self, repo_path="./", src_lang="", tgt_lang=""):
+    def __init__(self, repo_path="./", src_lang="", tgt_lang="", metrics=None):
         self.repo_path = Path(repo_path)
         self.src_lang = src_lang
         self.tgt_lang = tgt_lang
+        self.metrics = metrics
 
-    def get_stats(self, commits):
+    def get_stats(self, commits, matrix=None):
         """
         Get the translation stats from commit history after setting status.
         Parameters
@@ -87,6 +134,10 @@ class FileReporter:
                     }
                 }
             }
+        matrix: StatusMatrix or None, default: None
+            Status matrix of the commit history, e.g. reader.matrix with the
+            "numpy" engine. If specified, the stats are counted over the matrix
+            instead of the commit dictionary.
 
         Returns
         -------
@@ -100,6 +151,9 @@ class FileReporter:
                 }
             }
         """
+        if matrix is not None:
+            return matrix.get_stats()
+
         stats = {}
 
         for basefile in commits:
@@ -141,80 +195,111 @@ class FileReporter:
                 [lang, stat["total"], stat["open"], stat["updated"], stat["completed"]]
             )
 
-        print(
-            tabulate(
-                data,
-                headers=["Target Language", "Total", "Open", "Updated", "Completed"],
-                tablefmt="orgtbl",
-            )
+        print_table(
+            data, headers=["Target Language", "Total", "Open", "Updated", "Completed"]
         )
 
         if dump_path != "":
             with open(Path(dump_path) / "translation_stats.json", "w+") as outfile:
                 json.dump(stats, outfile, indent=4)
 
-    def get_details(self, commits):
+    def get_details(self, commits, workers=None):
         """
         Get details of translation needs containing File (target filename), Status
         (Open, Updated, or Completed), Source Language, Target Language, Word
-        Count, and Percent Change.
+        Count, and Percent Change. Only the pairs of the src_lang and tgt_lang of
+        the reporter are computed, if specified.
+        Parameters
+        ----------
+        commits: dictionary
+            Commit history of the repository after setting status.
+        workers: int or None, default: None
+            Maximum number of threads to count the words of the source files. If
+            not specified, the default of ThreadPoolExecutor is used.
         Returns
         -------
         details: list
-            [{
-                "basefile": name of the source file
-                "status": "open" or "updated",
-                "src_lang": source language,
-                "tgt_lang": target language,
-                "wc": word count,
-                "pc": percent change
-            }]
+            [Detail(
+                basefile: name of the source file,
+                status: "open", "updated" or "completed",
+                src_lang: source language,
+                wc: word count (int),
+                tgt_lang: target language,
+                pc: percent completed (float, fraction of the source file),
+                pu: percent updated (float, fraction of the source file)
+            )]
         """
-        details = []
-        for basefile in commits:
+        return list(self.iter_details(commits, workers=workers))
 
+    def iter_details(self, commits, workers=None):
+        """
+        Generate the Detail records of get_details one by one, as the word counts
+        of the source files come in, so that they can be streamed to a report
+        with dump_details without holding all of them in memory.
+        Parameters
+        ----------
+        commits: dictionary
+            Commit history of the repository after setting status.
+        workers: int or None, default: None
+            Maximum number of threads to count the words of the source files.
+        Yields
+        ------
+        detail: Detail
+            Translation need of a target file, in the order of get_details.
+        """
+        # Search for the src_lang of each basefile with requested pairs
+        sources = {}
+        for basefile in commits:
             files = commits[basefile]
 
-            # Search for the src_lang
+            if self.tgt_lang != "" and (
+                self.tgt_lang not in files
+                or files[self.tgt_lang]["status"] == "source"
+            ):
+                continue
+
             for lang in files:
                 if files[lang]["status"] == "source":
-                    src_lang = lang
+                    if self.src_lang == "" or self.src_lang == lang:
+                        sources[basefile] = lang
                     break
 
-            # Calculate word count of the source file
-            wc = self.word_count(files[src_lang]["filename"])
-
-            for lang in files:
-                status = files[lang]["status"]
-                if status == "source":
-                    continue
-                # File in "open" status is 100% percent updated and 0% percent completed
-                elif status == "open":
-                    pu = 1.0
-                    pc = 0
-                # Compute percent updated and percent completed for file in updated status
-                elif status == "updated":
-                    pu, pc = self.compute_pct(files[src_lang], files[lang])
-                # File in "completed" status is 0% percent updated. Note that
-                # some target file's last commit time might be the same as the
-                # source file but not 100% completed, pc can give an estimation
-                # of translation work needed in that case
-                else:
-                    pu, pc = self.compute_pct(files[src_lang], files[lang])
-
-                details.append(
-                    {
-                        "basefile": basefile,
-                        "status": status,
-                        "src_lang": src_lang,
-                        "wc": str(wc),
-                        "tgt_lang": lang,
-                        "pc": str(round(pc * 100, 1)) + "%",
-                        "pu": str(round(pu * 100, 1)) + "%",
-                    }
-                )
-
-        return details
+        # Calculate word count of the source files in parallel, in order
+        filenames = [commits[b][sources[b]]["filename"] for b in sources]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            word_counts = executor.map(self.word_count, filenames)
+
+            for basefile, wc in zip(sources, word_counts):
+                files = commits[basefile]
+                src_lang = sources[basefile]
+
+                for lang in files:
+                    if self.tgt_lang != "" and self.tgt_lang != lang:
+                        continue
+
+                    status = files[lang]["status"]
+                    if status == "source":
+                        continue
+                    # File in "open" status is 100% percent updated and 0% percent
+                    # completed
+                    elif status == "open":
+                        pu = 1.0
+                        pc = 0.0
+                    # Compute percent updated and percent completed for file in
+                    # updated status
+                    elif status == "updated":
+                        pu, pc = self.compute_pct(files[src_lang], files[lang])
+                    # File in "completed" status is 0% percent updated. Note that
+                    # some target file's last commit time might be the same as the
+                    # source file but not 100% completed, pc can give an estimation
+                    # of translation work needed in that case
+                    else:
+                        pu, pc = self.compute_pct(files[src_lang], files[lang])
+
+                    yield Detail(basefile, status, src_lang, wc, lang, pc, pu)
+
+        if self.metrics is not None:
+            self.metrics.save()
 
     def print_score(self, details):
         """
@@ -222,15 +307,7 @@ class FileReporter:
         Parameters
         ----------
         details: list
-            [{
-                "basefile": name of the source file
-                "status": "open" or "updated",
-                "src_lang": source language,
-                "tgt_lang": target language,
-                "wc": word count,
-                "pc": percent complete
-                "pu": percent updated
-            }]
+            List of Detail records from get_details.
         Returns
         -------
         score: float
@@ -238,70 +315,137 @@ class FileReporter:
         """
         sum_scores = 0
         for row in details:
-            pu = float(row["pu"].strip("%")) / 100
-            pc = float(row["pc"].strip("%")) / 100
             # For "completed" and "updated", translation coverage is pc (percent
             # completed) - pu (percent updated); for "open", translation coverage
             # is zero.
-            if row["status"] in ["completed", "updated"]:
-                sum_scores += pc - pu
+            if row.status in ["completed", "updated"]:
+                sum_scores += row.pc - row.pu
 
-        score =  round(sum_scores / len(details) * 100, 1)
+        # The language filters of the reporter can leave no target file
+        if details:
+            score = round(sum_scores / len(details) * 100, 1)
+        else:
+            score = 0.0
 
         print("Translation coverage {}%".format(str(score)))
         return score
 
-    def print_details(self, details, dump_path=""):
+    def print_details(
+        self, details, dump_path="", top=None, sort_by="wc", page_size=None
+    ):
         """
         Print out the details of the work required for translating each target
         file, its open/updated/completed status, source and target language, and 
         the count of words in the source file.
         Parameters
         ----------
+        details: list
+            List of Detail records from get_details.
         dump_path: string
             Path to save the json file. Default to "".
+        top: int or None, default: None
+            Number of rows to print, picking those with the largest sort_by
+            value in that order. If not specified, all rows are printed in the
+            order of details.
+        sort_by: string, choices: "wc", "pu", default: "wc"
+            Field to pick the top rows by, word count or percent updated.
+        page_size: int or None, default: None
+            Number of rows of each page of the table. If not specified, the table
+            is printed in a single page.
         """
-        data = []
-        for row in details:
-            if (self.src_lang == "" or self.src_lang == row["src_lang"]) and (
-                self.tgt_lang == "" or self.tgt_lang == row["tgt_lang"]
-            ):
-
-                data.append(
-                    [
-                        row["basefile"],
-                        row["status"],
-                        row["src_lang"],
-                        row["wc"],
-                        row["tgt_lang"],
-                        row["pc"],
-                        row["pu"],
-                    ]
-                )
-        # Print detail data in tabulate format
-        print(
-            tabulate(
-                data,
-                headers=[
-                    "File",
-                    "Status",
-                    "Source Language",
-                    "Word Count",
-                    "Target Language",
-                    "Percent Completed",
-                    "Percent Updated",
-                ],
-                tablefmt="orgtbl",
+        if sort_by not in SORT_KEYS:
+            raise Exception(
+                "Please specify sort_by from {}".format(", ".join(SORT_KEYS))
             )
+
+        rows = (
+            row
+            for row in details
+            if (self.src_lang == "" or self.src_lang == row.src_lang)
+            and (self.tgt_lang == "" or self.tgt_lang == row.tgt_lang)
+        )
+        # Keep a heap of the top rows rather than sorting all of them
+        if top is not None:
+            rows = heapq.nlargest(top, rows, key=lambda row: getattr(row, sort_by))
+
+        data = (
+            [
+                row.basefile,
+                row.status,
+                row.src_lang,
+                row.wc,
+                row.tgt_lang,
+                format_pct(row.pc),
+                format_pct(row.pu),
+            ]
+            for row in rows
+        )
+        # Print detail data in fixed-width format
+        print_table(
+            data,
+            headers=[
+                "File",
+                "Status",
+                "Source Language",
+                "Word Count",
+                "Target Language",
+                "Percent Completed",
+                "Percent Updated",
+            ],
+            page_size=page_size,
+            # Only the word count is aligned as a number, whatever the file names
+            numeric=[False, False, False, True, False, False, False],
         )
 
         if dump_path != "":
             with open(Path(dump_path) / "translation_details.json", "w+") as outfile:
-                json.dump(details, outfile, indent=4)
+                json.dump([row._asdict() for row in details], outfile, indent=4)
+
+    def dump_stats(self, stats, dump_path=".", format="jsonl"):
+        """
+        Write the translation stats with one row per locale.
+        Parameters
+        ----------
+        stats: dictionary
+            Stats from get_stats.
+        dump_path: string, default: "."
+            Path to the directory of the report.
+        format: string, choices: "jsonl", "csv", default: "jsonl"
+            Format of the report.
+        Returns
+        -------
+        filename: Path
+            Path to the written translation_stats.<format> file.
+        """
+        filename = Path(dump_path) / "translation_stats.{}".format(format)
+        write_rows(stats_rows(stats), filename, format=format)
+        return filename
+
+    def dump_details(self, details, dump_path=".", format="jsonl"):
+        """
+        Stream the Detail records into a report row by row, e.g. straight from
+        iter_details so that large reports are written in constant memory.
+        Parameters
+        ----------
+        details: iterable
+            Detail records from get_details or iter_details.
+        dump_path: string, default: "."
+            Path to the directory of the report.
+        format: string, choices: "jsonl", "csv", default: "jsonl"
+            Format of the report.
+        Returns
+        -------
+        filename: Path
+            Path to the written translation_details.<format> file.
+        """
+        filename = Path(dump_path) / "translation_details.{}".format(format)
+        write_rows(details, filename, format=format, fields=Detail._fields)
+        return filename
 
     def word_count(self, file):
         """
-        Estimate the word count of a given file.
+        Estimate the word count of a given file, excluding the front matter and
+        fenced code blocks, with CJK characters counted one by one.
 
         Parameters
         ----------
@@ -313,13 +457,12 @@ class FileReporter:
         wc: int
             Estimation of word count.
         """
-        wc = 0
-        with open(self.repo_path / file, "r+") as f:
-            for line in f:
-                if line.isspace():
-                    continue
-                wc += len(line.split(" "))
-        return wc
+        if self.metrics is not None:
+            metrics = self.metrics.get(file)
+            if metrics is not None:
+                return metrics["words"]
+
+        return count_words((self.repo_path / file).read_bytes())
 
     def compute_pct(self, src_file, tgt_file):
         """
@@ -349,11 +492,11 @@ class FileReporter:
 
         # pu = 0 and pc = 1 for empty files
         if src_n_lines == 0:
-            return 0, 1
+            return 0.0, 1.0
 
         # Compute percentage updated: pu
         if tgt_lt >= src_lt:
-            pu = 0
+            pu = 0.0
         else:
             # Count all additions in the source file after target file's last update timestamp
             cnt = 0
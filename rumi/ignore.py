@@ -0,0 +1,190 @@
+# rumi.ignore
+# Gitignore-style rules to skip files while discovering targets
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Gitignore-style rules to skip files while discovering targets
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import re
+
+from pathlib import Path
+
+
+# Name of the ignore file at the root of the repository
+IGNORE_FILE = ".rumiignore"
+
+
+##########################################################################
+# Helper Functions
+##########################################################################
+
+
+def translate(pattern):
+    """
+    Translate the glob of a gitignore pattern into a regular expression matching
+    paths relative to the repository, with "/" as separator.
+
+    Parameters
+    ----------
+    pattern: string
+        Glob of the pattern, without the leading "!" and trailing "/".
+
+    Returns
+    -------
+    regex: string
+        Regular expression matching the whole relative path.
+    """
+    # A pattern with a separator at the beginning or in the middle is relative
+    # to the root, otherwise it matches at any level below the root
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+
+    regex = "" if anchored else "(?:.*/)?"
+    i, n = 0, len(pattern)
+
+    while i < n:
+        char = pattern[i]
+
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif char == "*":
+            regex += "[^/]*"
+            i += 1
+        elif char == "?":
+            regex += "[^/]"
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                regex += re.escape(char)
+                i += 1
+            else:
+                chars = pattern[i + 1:end]
+                if chars.startswith("!"):
+                    chars = "^" + chars[1:]
+                regex += "[" + chars.replace("\\", "\\\\") + "]"
+                i = end + 1
+        elif char == "\\" and i + 1 < n:
+            regex += re.escape(pattern[i + 1])
+            i += 2
+        else:
+            regex += re.escape(char)
+            i += 1
+
+    return regex
+
+
+##########################################################################
+# Class IgnoreMatcher
+##########################################################################
+
+
+class IgnoreMatcher:
+    """
+    IgnoreMatcher compiles gitignore-style rules into a single regular expression
+    for files and a single one for directories, so that each path is checked
+    with one match whatever the number of rules. As in gitignore, the last rule
+    matching a path decides whether it is ignored, a rule starting with "!"
+    re-includes the path and a rule ending with "/" only matches directories.
+
+    Parameters
+    ----------
+    rules: iterable, default: ()
+        Lines of gitignore-style rules, blank lines and comments are skipped.
+    """
+
+    def __init__(self, rules=()):
+        # [(regex, negated, dir_only)]
+        self.rules = []
+
+        for rule in rules:
+            rule = rule.rstrip("\n").rstrip()
+
+            if not rule or rule.startswith("#"):
+                continue
+
+            negated = rule.startswith("!")
+            if negated:
+                rule = rule[1:]
+            elif rule.startswith("\\!") or rule.startswith("\\#"):
+                rule = rule[1:]
+
+            dir_only = rule.endswith("/")
+            rule = rule.rstrip("/")
+            if not rule:
+                continue
+
+            self.rules.append((translate(rule), negated, dir_only))
+
+        self.file_regex = self.compile(dir_only=False)
+        self.dir_regex = self.compile(dir_only=True)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Load the rules from an ignore file, no rule is loaded if it does not exist.
+        """
+        path = Path(path)
+        if not path.is_file():
+            return cls()
+
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f)
+
+    def __bool__(self):
+        return len(self.rules) > 0
+
+    def compile(self, dir_only):
+        """
+        Compile the rules into one regular expression, with one named group for
+        each rule. The rules are reversed so that the first alternative matching
+        a path is the last matching rule.
+        """
+        alternatives = []
+        for idx in reversed(range(len(self.rules))):
+            regex, _, rule_dir_only = self.rules[idx]
+            if rule_dir_only and not dir_only:
+                continue
+            alternatives.append("(?P<r{}>{})".format(idx, regex))
+
+        if not alternatives:
+            return None
+        return re.compile("|".join(alternatives))
+
+    def match(self, path, is_dir=False):
+        """
+        Check if a path is ignored.
+
+        Parameters
+        ----------
+        path: string or Path object
+            Path relative to the root of the repository.
+        is_dir: bool, default: False
+            Whether the path is a directory.
+
+        Returns
+        -------
+        ignored: bool
+            True if the last rule matching the path is not negated.
+        """
+        regex = self.dir_regex if is_dir else self.file_regex
+        if regex is None:
+            return False
+
+        matched = regex.fullmatch(Path(path).as_posix())
+        if matched is None:
+            return False
+
+        return not self.rules[int(matched.lastgroup[1:])][1]
@@ -0,0 +1,224 @@
+# rumi.metrics
+# Persistent blob-keyed metrics of the target files
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Persistent blob-keyed metrics of the target files
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import re
+import threading
+
+from pathlib import Path
+from rumi.cache import BlobCache
+
+
+# Front matter delimiters of hugo contents, by opening delimiter
+FRONT_MATTER = {b"---": b"---", b"+++": b"+++", b"{": b"}"}
+
+# Opening characters of markdown fenced code blocks
+FENCES = (b"```", b"~~~")
+
+# Han, Hiragana and Katakana characters are counted as one word each, and any
+# other run of non-space characters is one word
+CJK = r"\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\U00020000-\U0002fa1f"
+WORDS = re.compile(r"[{0}]|[^\s{0}]+".format(CJK))
+
+
+##########################################################################
+# Helper Functions
+##########################################################################
+
+
+def count_lines(data):
+    """
+    Count the lines of the content of a file, including a last line without
+    line break.
+    """
+    lines = data.count(b"\n")
+    if data and not data.endswith(b"\n"):
+        lines += 1
+    return lines
+
+
+def strip_markdown(data):
+    """
+    Remove the front matter and the fenced code blocks from the content of a
+    markdown file, keeping only the prose.
+
+    Parameters
+    ----------
+    data: bytes
+        Content of the file.
+
+    Returns
+    -------
+    prose: bytes
+        Content without front matter and fenced code blocks.
+    """
+    # Front matter is the header between delimiter lines at the start
+    first, _, rest = data.partition(b"\n")
+    closing = FRONT_MATTER.get(first.strip())
+    if closing is not None:
+        pos = 0
+        for line in rest.splitlines(keepends=True):
+            pos += len(line)
+            if line.strip() == closing:
+                data = rest[pos:]
+                break
+
+    # Files without fences need no line by line scan
+    if not any(fence in data for fence in FENCES):
+        return data
+
+    prose = []
+    fence = None
+    for line in data.splitlines(keepends=True):
+        stripped = line.lstrip(b" ")
+        if fence is None:
+            if stripped[:3] in FENCES and len(line) - len(stripped) < 4:
+                # Opening fence, e.g. ``` or ~~~~python
+                char = stripped[:1]
+                fence = char * (len(stripped) - len(stripped.lstrip(char)))
+            else:
+                prose.append(line)
+        elif stripped.startswith(fence) and not stripped.strip().strip(fence[:1]):
+            # Closing fence of the same character, at least as long
+            fence = None
+
+    return b"".join(prose)
+
+
+def count_words(data, markdown=True):
+    """
+    Count the words of the content of a file in a single regular expression
+    pass, where Han, Hiragana and Katakana characters are counted one by one.
+
+    Parameters
+    ----------
+    data: bytes
+        Content of the file.
+    markdown: bool, default: True
+        Whether to exclude the front matter and the fenced code blocks.
+
+    Returns
+    -------
+    words: int
+        Number of words.
+    """
+    if markdown:
+        data = strip_markdown(data)
+    return len(WORDS.findall(data.decode("utf-8", errors="replace")))
+
+
+def count_metrics(data):
+    """
+    Count the lines, words and bytes of the content of a file.
+
+    Parameters
+    ----------
+    data: bytes
+        Content of the file.
+
+    Returns
+    -------
+    metrics: dictionary
+        {"lines": int, "words": int, "bytes": int}
+    """
+    return {
+        "lines": count_lines(data),
+        "words": count_words(data),
+        "bytes": len(data),
+    }
+
+
+##########################################################################
+# Class MetricsStore
+##########################################################################
+
+
+class MetricsStore:
+    """
+    MetricsStore maps the blob SHA of the target files to their metrics, such as
+    the number of lines and words. Blobs are content-addressed, so the metrics of
+    a blob are computed once and cached forever, and a file is only read when its
+    content changed since the metrics were last cached. Metrics can be looked up
+    from several threads, e.g. the word counts of FileReporter.get_details.
+
+    Parameters
+    ----------
+    cache: BlobCache or None, default: None
+        Cache of the metrics by blob SHA. If not specified, the metrics are only
+        cached in memory.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = (
+            cache
+            if cache is not None
+            else BlobCache("", "file", "metrics", persist=False)
+        )
+        # Gitpython Repo object to read the blobs from
+        self.repo = None
+        # Blob SHA of each file, {path: sha}
+        self.blobs = {}
+        # Gitpython reads blobs through a single git process, which is not thread
+        # safe, so reads and cache updates are serialized
+        self.lock = threading.Lock()
+
+    def set_blobs(self, repo, blobs):
+        """
+        Set the blob SHA of the files to get the metrics of.
+
+        Parameters
+        ----------
+        repo: object
+            Gitpython Repo object to read the blobs from.
+        blobs: dictionary
+            {path: blob SHA}, with paths relative to the root of the repository.
+        """
+        self.repo = repo
+        self.blobs = blobs
+
+    def get(self, path):
+        """
+        Get the metrics of a file.
+
+        Parameters
+        ----------
+        path: string or Path object
+            Path to the file from the root of the repository.
+
+        Returns
+        -------
+        metrics: dictionary or None
+            {"lines": int, "words": int, "bytes": int}, None if the blob of the
+            file is unknown.
+        """
+        sha = self.blobs.get(Path(path).as_posix())
+        if sha is None:
+            return None
+
+        metrics = self.cache.get(sha)
+        if metrics is None:
+            with self.lock:
+                data = self.repo.odb.stream(bytes.fromhex(sha)).read()
+
+            # Count outside of the lock, concurrent counts of a blob are equal
+            metrics = count_metrics(data)
+            with self.lock:
+                self.cache[sha] = metrics
+        return metrics
+
+    def save(self):
+        """
+        Persist the metrics computed since the last save.
+        """
+        self.cache.save()
@@ -16,3 +16,5 @@ react app projects set up with lingui.js.
 
 from .reader import *
 from .reporter import *
+from .memory import *
+from .catalog import *
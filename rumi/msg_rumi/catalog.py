@@ -0,0 +1,371 @@
+# rumi.msg_rumi.catalog
+# Git history reader for key-level monitoring of structured catalogs
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Git history reader for key-level monitoring of structured catalogs, such as hugo
+i18n string tables in TOML or YAML and lingui.js JSON catalogs.
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import json
+import sys
+
+from pathlib import Path
+from datetime import datetime
+from rumi.base_reader import BaseReader
+from rumi.cache import BlobCache, Cache
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover
+    yaml = None
+
+
+# Translation of a deleted key
+DELETED = '"deleted"'
+
+# Hash of the empty tree, to diff the root commit against
+EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+##########################################################################
+# Helper Functions
+##########################################################################
+
+
+def flatten(catalog, prefix=""):
+    """
+    Flatten nested tables of a catalog into a key -> value map, joining the keys
+    of the nested tables with ".", e.g. {"home": {"other": "Home"}} becomes
+    {"home.other": "Home"}.
+    """
+    # Legacy hugo i18n format: [{"id": key, "translation": value}]
+    if isinstance(catalog, list) and all(
+        isinstance(item, dict) and "id" in item for item in catalog
+    ):
+        catalog = {item["id"]: item.get("translation", "") for item in catalog}
+
+    if isinstance(catalog, list):
+        catalog = {str(idx): item for idx, item in enumerate(catalog)}
+
+    if not isinstance(catalog, dict):
+        return {prefix: "" if catalog is None else str(catalog)}
+
+    msgs = {}
+    for key, value in catalog.items():
+        key = "{}.{}".format(prefix, key) if prefix else str(key)
+        if isinstance(value, (dict, list)):
+            msgs.update(flatten(value, key))
+        else:
+            msgs[key] = "" if value is None else str(value)
+    return msgs
+
+
+def parse_catalog(data, suffix):
+    """
+    Parse the content of a structured catalog into a key -> value map.
+
+    Parameters
+    ----------
+    data: bytes
+        Content of the catalog file.
+    suffix: string
+        Extension of the catalog file: ".json", ".toml", ".yaml" or ".yml".
+
+    Returns
+    -------
+    msgs: dictionary
+        {key: value}
+    """
+    text = data.decode("utf-8")
+    if not text.strip():
+        return {}
+
+    if suffix == ".json":
+        catalog = json.loads(text)
+    elif suffix == ".toml":
+        if tomllib is None:
+            raise Exception("Please install tomli to parse {} catalogs".format(suffix))
+        catalog = tomllib.loads(text)
+    elif suffix in (".yaml", ".yml"):
+        if yaml is None:
+            raise Exception("Please install pyyaml to parse {} catalogs".format(suffix))
+        catalog = yaml.safe_load(text)
+    else:
+        raise Exception("Unable to parse {} catalogs".format(suffix))
+
+    return flatten(catalog)
+
+
+##########################################################################
+# Class CatalogReader
+##########################################################################
+
+
+class CatalogReader(BaseReader):
+    """
+    CatalogReader reads the github history of structured catalogs (key/value
+    string tables in JSON, TOML or YAML) and parses it into the same commit
+    dictionary as MsgReader, with one message per key, so that it can be
+    reported with MsgReporter. Each catalog blob is parsed once and memoized by
+    blob SHA, and the status of each key comes from comparing the successive
+    snapshots of the catalogs.
+
+    Parameters
+    ----------
+    repo_path: string, default: "."
+        Path to the repository for translation monitoring.
+    branch: string, default: "main"
+        Name of the branch to read the github history from. Default to "main".
+    content_paths: list, default: ["i18n"]
+        List of paths from the root of the repository to the directory that
+        contains the catalogs, e.g., ["i18n", "src/locales"].
+    extensions: list, default: [".toml", ".yaml", ".yml", ".json"]
+        List of extensions of the catalogs.
+    pattern: string, choices: "folder/", ".lang"
+        Two types of patterns in which the catalogs are organized: "folder/"
+        (e.g. locales/en/messages.json) and ".lang" (e.g. i18n/en.toml or
+        messages.en.json).
+    src_lang: string, default: "en"
+        Source language of the catalogs.
+    use_cache: bool, default: True
+        Whether to use cached commit history datastructure and parsed catalogs.
+    discover: string, choices: "walk", "index", "tree", default: "walk"
+        How to discover the target files: "walk" walks the content paths on disk,
+        "index" lists the files tracked in the git index, and "tree" lists the
+        files in the tree of the branch.
+    """
+
+    def __init__(
+        self,
+        repo_path=".",
+        branch="main",
+        content_paths=["i18n"],
+        extensions=[".toml", ".yaml", ".yml", ".json"],
+        pattern=".lang",
+        src_lang="en",
+        use_cache=True,
+        discover="walk",
+    ) -> None:
+        super().__init__(
+            content_paths=content_paths.copy(),
+            extensions=extensions.copy(),
+            repo_path=repo_path,
+            branch=branch,
+            discover=discover,
+        )
+        self.pattern = pattern
+        self.src_lang = src_lang
+
+        self.use_cache = use_cache
+        repo_name = self.repo_path.stem
+        if self.use_cache:
+            self.cache = Cache(repo_name=repo_name, which_rumi="catalog")
+
+        # Parsed catalogs by blob SHA, only persisted when using cache
+        self.catalogs = BlobCache(
+            repo_name=repo_name,
+            which_rumi="catalog",
+            name="catalogs",
+            persist=self.use_cache,
+        )
+
+    def parse_lang(self, filename):
+        """
+        Parse language from filename, the name of the parent directory for
+        "folder/" and the last extension before the file type for ".lang".
+        """
+        path = Path(filename)
+
+        if self.pattern == "folder/":
+            lang = path.parent.name
+        elif self.pattern == ".lang":
+            lang = path.stem.rsplit(".", 1)[-1]
+        else:
+            raise Exception("Unable to parse file {}".format(filename))
+
+        if not lang:
+            raise Exception("Unable to parse file {}".format(filename))
+        return sys.intern(lang)
+
+    def read_catalog(self, blob, path):
+        """
+        Get the key -> value map of a catalog blob, parsing it only if the blob
+        has never been seen.
+        """
+        if blob is None:
+            return {}
+
+        if blob.hexsha not in self.catalogs:
+            data = blob.data_stream.read()
+            self.catalogs[blob.hexsha] = parse_catalog(data, Path(path).suffix)
+        return self.catalogs[blob.hexsha]
+
+    def parse_history(self):
+        """
+        Parse the git history of the catalogs into a dictionary of message commit
+        history, with one message per key.
+
+        Returns
+        -------
+        commits: dictionary
+            {
+                key: {
+                    locale: {
+                        "filename": name of the catalog that contains the key,
+                        "ft": timestamp of the first commit (float),
+                        "lt": timestamp of the last commit (float),
+                        "history": [
+                            (timestamp (float), value)
+                        ]
+                    }
+                }
+            }
+            Locales missing a key of the source catalog get an empty value at the
+            last commit time of the source, with "filename" None.
+        """
+        repo = self.get_repo()
+        targets = {path.as_posix() for path in self.targets}
+
+        # Iterate through commits from the first to the last
+        if self.use_cache:
+            commits = self.cache.load_cache()
+            history = repo.iter_commits(paths=self.targets, since=self.cache.since())
+        else:
+            commits = {}
+            history = repo.iter_commits(paths=self.targets)
+
+        for commit in reversed(list(history)):
+
+            timestamp = float(datetime.timestamp(commit.authored_datetime))
+
+            # Compare each changed catalog with its snapshot in the parent commit,
+            # or with the empty tree for the root commit so that the catalogs
+            # of the root commit are on the b side as well
+            if commit.parents:
+                diffs = commit.parents[0].diff(commit)
+            else:
+                diffs = commit.diff(EMPTY_TREE, R=True)
+
+            for item in diffs:
+                path = item.b_path if item.b_blob else item.a_path
+                if path not in targets:
+                    continue
+
+                old = self.read_catalog(item.a_blob, item.a_path)
+                new = self.read_catalog(item.b_blob, item.b_path)
+                self.compare_snapshots(commits, timestamp, path, old, new)
+
+        self.fill_locales(commits)
+        self.catalogs.save()
+
+        if self.use_cache:
+            self.cache.write_cache(commits)
+
+        return commits
+
+    def compare_snapshots(self, commits, timestamp, path, old, new):
+        """
+        Record the keys added, changed and deleted between two successive
+        snapshots of a catalog.
+
+        Parameters
+        ----------
+        commits: dictionary
+            Commit history datastructure.
+        timestamp: float
+            Float format of commit.authored_datetime.
+        path: string
+            Path to the catalog.
+        old: dictionary
+            {key: value} before the commit.
+        new: dictionary
+            {key: value} after the commit.
+        """
+        locale = self.parse_lang(path)
+        fname = Path(path)
+
+        for key, value in new.items():
+            if key in old and old[key] == value:
+                continue
+
+            key = sys.intern(key)
+            if key not in commits:
+                commits[key] = {}
+
+            entry = commits[key].get(locale)
+            if entry is None or entry["filename"] is None:
+                entry = commits[key][locale] = {
+                    "filename": fname,
+                    "ft": timestamp,
+                    "lt": timestamp,
+                    "history": [],
+                }
+
+            entry["history"].append((timestamp, value))
+            entry["lt"] = timestamp
+
+        for key in old:
+            if key in new or locale not in commits.get(key, {}):
+                continue
+
+            if locale != self.src_lang:
+                # A key removed from a target catalog is open again, and gets
+                # its empty value from fill_locales
+                del commits[key][locale]
+                if not commits[key]:
+                    del commits[key]
+                continue
+
+            entry = commits[key][locale]
+            entry["history"].append((timestamp, DELETED))
+            entry["lt"] = timestamp
+
+    def fill_locales(self, commits):
+        """
+        Give each key of the source catalogs an entry in every locale, where the
+        locales missing the key have an empty value at the last commit time of
+        the source, i.e. the key is open in that locale. Keys deleted from the
+        source catalogs and keys that are only in target catalogs have nothing
+        to translate and are not filled, the reporters skip them.
+        """
+        locales = {self.parse_lang(path) for path in self.targets}
+        locales.update(locale for files in commits.values() for locale in files)
+
+        for key in commits:
+            files = commits[key]
+            if self.src_lang not in files:
+                continue
+
+            src = files[self.src_lang]
+            if src["history"][-1][-1] == DELETED:
+                # Drop the empty values given while the key was in the source
+                for locale in list(files):
+                    if files[locale]["filename"] is None:
+                        del files[locale]
+                continue
+
+            src_lt = src["lt"]
+            for locale in locales:
+                if locale not in files or files[locale]["filename"] is None:
+                    files[locale] = {
+                        "filename": None,
+                        "ft": src_lt,
+                        "lt": src_lt,
+                        "history": [(src_lt, "")],
+                    }
@@ -0,0 +1,278 @@
+# rumi.msg_rumi.memory
+# Translation memory for message-based translation monitoring
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Translation memory for message-based translation monitoring
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import math
+import sys
+
+
+# Translations that do not carry any translated content
+EMPTY_MSGS = {"", '""', "deleted", '"deleted"'}
+
+
+##########################################################################
+# Helper Functions
+##########################################################################
+
+
+def unquote(msg):
+    """
+    Remove the surrounding quotes of a message.
+    """
+    msg = msg.strip()
+    if len(msg) > 1 and msg.startswith('"') and msg.endswith('"'):
+        msg = msg[1:-1]
+    return msg
+
+
+def normalize(msg):
+    """
+    Normalize a message for matching by removing the surrounding quotes,
+    folding the case and collapsing white spaces.
+    """
+    return " ".join(unquote(msg).casefold().split())
+
+
+def shingles(msg, n=3):
+    """
+    Get the set of character n-grams (shingles) of a message.
+
+    Parameters
+    ----------
+    msg: string
+        Message to shingle.
+    n: int, default: 3
+        Number of characters in each shingle.
+
+    Returns
+    -------
+    grams: frozenset
+        Set of shingles of the normalized message. Messages shorter than n
+        are a single shingle.
+    """
+    text = normalize(msg)
+    if len(text) <= n:
+        return frozenset([text])
+    return frozenset(text[i:i + n] for i in range(len(text) - n + 1))
+
+
+def similarity(grams1, grams2):
+    """
+    Dice coefficient between two sets of shingles.
+    """
+    if not grams1 and not grams2:
+        return 1.0
+    return 2 * len(grams1 & grams2) / (len(grams1) + len(grams2))
+
+
+##########################################################################
+# Class ShingleIndex
+##########################################################################
+
+
+class ShingleIndex:
+    """
+    Inverted index from shingles to messages, used to look up similar messages
+    without comparing against the whole catalog. Only the rarest shingles of a
+    query are probed (prefix filtering), which guarantees that every message
+    above the similarity threshold is found while skipping the long posting
+    lists of frequent shingles.
+
+    Parameters
+    ----------
+    n: int, default: 3
+        Number of characters in each shingle.
+    """
+
+    def __init__(self, n=3):
+        self.n = n
+        self.postings = {}
+        self.grams = {}
+
+    def __len__(self):
+        return len(self.grams)
+
+    def __contains__(self, key):
+        return key in self.grams
+
+    def add(self, key, msg):
+        """
+        Add a message to the index under key.
+        """
+        if key in self.grams:
+            self.remove(key)
+
+        grams = shingles(msg, self.n)
+        self.grams[key] = grams
+        for gram in grams:
+            self.postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key):
+        """
+        Remove the message stored under key from the index.
+        """
+        for gram in self.grams.pop(key):
+            keys = self.postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self.postings[gram]
+
+    def query(self, msg, threshold=0.7, limit=None):
+        """
+        Find the indexed messages similar to msg.
+
+        Parameters
+        ----------
+        msg: string
+            Message to look up.
+        threshold: float, default: 0.7
+            Minimum similarity (between 0 and 1) of the returned messages.
+        limit: int, default: None
+            Maximum number of results, all results if not specified.
+
+        Returns
+        -------
+        matches: list
+            [(similarity, key)] sorted from the most to the least similar.
+        """
+        grams = shingles(msg, self.n)
+
+        # A message sharing fewer than min_overlap shingles with the query can
+        # not reach the threshold, so any match has to share at least one of
+        # the len(grams) - min_overlap + 1 rarest shingles of the query
+        if threshold > 0:
+            min_overlap = math.ceil(threshold * len(grams) / (2 - threshold))
+        else:
+            min_overlap = 1
+        prefix = len(grams) - max(min_overlap, 1) + 1
+
+        rarest = sorted(grams, key=lambda gram: len(self.postings.get(gram, ())))
+
+        candidates = set()
+        for gram in rarest[:prefix]:
+            candidates.update(self.postings.get(gram, ()))
+
+        matches = []
+        for key in candidates:
+            score = similarity(grams, self.grams[key])
+            if score >= threshold:
+                matches.append((score, key))
+
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        return matches[:limit] if limit else matches
+
+
+##########################################################################
+# Class TranslationMemory
+##########################################################################
+
+
+class TranslationMemory:
+    """
+    TranslationMemory indexes the source messages of a commit history together
+    with their latest translation in each locale, and suggests translations for
+    new messages based on exact and fuzzy matches of the source message.
+
+    Parameters
+    ----------
+    commits: dictionary
+        Commit history from MsgReader.parse_history.
+    src_lang: string
+        Source language as set up with lingui.js.
+    n: int, default: 3
+        Number of characters in each shingle of the fuzzy match index.
+    """
+
+    def __init__(self, commits, src_lang, n=3):
+        self.src_lang = src_lang
+        self.index = ShingleIndex(n=n)
+        # {msgid: {locale: translation}}
+        self.translations = {}
+
+        for msg in commits:
+            for locale in commits[msg]:
+                if locale == src_lang:
+                    continue
+
+                translation = self.latest_translation(commits[msg][locale])
+                if translation is not None:
+                    self.add(msg, locale, translation)
+
+    def __len__(self):
+        return len(self.translations)
+
+    def latest_translation(self, entry):
+        """
+        Get the latest non-empty translation from the history of a message,
+        or None if the message has never been translated.
+        """
+        for _, translation in reversed(entry.get("history", [])):
+            if translation not in EMPTY_MSGS:
+                return translation
+        return None
+
+    def add(self, msgid, locale, translation):
+        """
+        Add the translation of msgid in locale to the memory.
+        """
+        if msgid not in self.translations:
+            self.translations[msgid] = {}
+            self.index.add(msgid, msgid)
+        self.translations[msgid][sys.intern(locale)] = translation
+
+    def suggest(self, msgid, locale, threshold=0.7, limit=3):
+        """
+        Suggest translations of msgid in locale.
+
+        Parameters
+        ----------
+        msgid: string
+            Source message to be translated.
+        locale: string
+            Target language.
+        threshold: float, default: 0.7
+            Minimum similarity (between 0 and 1) of the suggested source messages.
+        limit: int, default: 3
+            Maximum number of suggestions.
+
+        Returns
+        -------
+        suggestions: list
+            [{
+                "score": similarity of the source messages,
+                "exact": whether the source messages are equal once unquoted,
+                "msgid": source message of the suggestion,
+                "msgstr": translation of the source message
+            }]
+            Exact matches come first. Shingles ignore case, white spaces and
+            repetitions, so a fuzzy match can also have a score of 1.0 without
+            being exact.
+        """
+        text = unquote(msgid)
+        matches = [
+            (unquote(key) == text, score, key)
+            for score, key in self.index.query(msgid, threshold=threshold)
+            if locale in self.translations[key]
+        ]
+        matches.sort(key=lambda match: (not match[0], -match[1], match[2]))
+
+        return [
+            {
+                "score": round(score, 3),
+                "exact": exact,
+                "msgid": key,
+                "msgstr": self.translations[key][locale],
+            }
+            for exact, score, key in matches[:limit]
+        ]
@@ -15,11 +15,15 @@ Git history reader for message-based translation monitoring
 
 import re
 import os
+import sys
 
 from pathlib import Path
+from itertools import chain
 from rumi.cache import Cache
 from datetime import datetime
 from rumi.base_reader import BaseReader
+from rumi.msg_rumi.memory import EMPTY_MSGS, ShingleIndex
+from rumi.records import encode, require_numpy, to_records
 
 
 ##########################################################################
@@ -49,6 +53,20 @@ class MsgReader(BaseReader):
         Source language as set up with lingui.js.
     use_cache: bool, default: True
         Whether to use cached commit history datastructure. 
+    history_size: int, default: None
+        Number of most recent translations to keep in the history of each
+        message and locale. The first and last commit timestamps are always
+        kept in "ft" and "lt", and so is the latest non-empty translation, which
+        updated messages are reported against. If not specified, the full
+        history is kept.
+    modify_threshold: float, default: 0.7
+        Minimum similarity (between 0 and 1) for a msgid added in a commit to be
+        paired with a msgid deleted in the same commit and recorded as a
+        modification of it. If None, added msgids are never paired.
+    discover: string, choices: "walk", "index", "tree", default: "walk"
+        How to discover the target files: "walk" walks the content paths on disk,
+        "index" lists the files tracked in the git index, and "tree" lists the
+        files in the tree of the branch.
     """
 
     def __init__(
@@ -59,6 +77,9 @@ class MsgReader(BaseReader):
         extensions=[".md"],
         src_lang="en",
         use_cache=True,
+        history_size=None,
+        modify_threshold=0.7,
+        discover="walk",
     ) -> None:
 
         super().__init__(
@@ -66,9 +87,19 @@ class MsgReader(BaseReader):
             extensions=extensions.copy(),
             repo_path=repo_path,
             branch=branch,
+            discover=discover,
         )
         self.src_lang = src_lang
 
+        if history_size is not None and history_size < 1:
+            raise Exception("Please specify a history_size of at least 1")
+        self.history_size = history_size
+        self.modify_threshold = modify_threshold
+
+        # Filenames are shared among all the entries of a file, so that each
+        # target file is stored as a single Path object in the commits
+        self._paths = {}
+
         self.use_cache = use_cache
         if self.use_cache:
             repo_name = self.repo_path.stem
@@ -99,12 +130,14 @@ class MsgReader(BaseReader):
         kind: string
             Kind of the modification, can be "msgid" or "msgstr".
         """
+        # Msgids and locales are repeated for every message and every locale,
+        # intern them so that each distinct string is stored only once
+        locale = sys.intern(locale)
 
         # Case when a message is deleted
         # It's translation is marked as "deleted" in the datastructure
         if kind == "msgid" and status == "del":
-            commits[content][locale]["history"].append((timestamp, '"deleted"'))
-            commits[content][locale]["lt"] = timestamp
+            self.append_history(commits[content][locale], timestamp, '"deleted"')
 
         # Case when a translation is added
         elif kind == "msgstr" and status == "add":
@@ -113,22 +146,146 @@ class MsgReader(BaseReader):
             # exception if not
             if not msgid:
                 raise Exception("Unable to parse file {}".format(fname))
+            msgid = sys.intern(msgid)
 
             # Add empty dict if msgid or locale has not been documented
             if msgid not in commits:
                 commits[msgid] = {}
             if locale not in commits[msgid]:
                 commits[msgid][locale] = {
-                    "filename": fname,
+                    "filename": self.get_path(fname),
                     "ft": timestamp,
                     "lt": timestamp,
                     "history": [],
                 }
 
-            commits[msgid][locale]["history"].append((timestamp, content))
-            commits[msgid][locale]["lt"] = timestamp
+            self.append_history(commits[msgid][locale], timestamp, content)
         return commits
 
+    def append_history(self, entry, timestamp, content):
+        """
+        Append a translation to the history of a message in one locale, and only
+        retain the latest history_size translations if specified.
+
+        Parameters
+        ----------
+        entry: dictionary
+            Commit history of the message in the locale.
+        timestamp: float
+            Float format of commit.authored_datetime.
+        content: string
+            Content of the msgstr (translation) or "deleted".
+        """
+        history = entry["history"]
+        history.append((timestamp, content))
+        entry["lt"] = timestamp
+        self.trim_history(entry)
+
+    def trim_history(self, entry):
+        """
+        Only retain the latest history_size translations of an entry, and the
+        latest non-empty translation if it is older.
+        """
+        history = entry["history"]
+        if self.history_size is None or len(history) <= self.history_size:
+            return
+
+        dropped = history[: -self.history_size]
+        del history[: -self.history_size]
+        if all(translation in EMPTY_MSGS for _, translation in history):
+            for item in reversed(dropped):
+                if item[1] not in EMPTY_MSGS:
+                    history.insert(0, item)
+                    break
+
+    def pair_modifications(self, commits, timestamp, locale, added, deleted):
+        """
+        Pair the msgids added to a file in a commit with the most similar msgids
+        deleted from the same file in the commit, and record each pair as a
+        modification of the deleted msgid: the added msgid takes over the
+        history of the deleted one and keeps it in "previous".
+
+        Parameters
+        ----------
+        commits: dictionary
+            Commit history datastructure.
+        timestamp: float
+            Float format of commit.authored_datetime.
+        locale: string
+            Target file language (locale).
+        added: set
+            Msgids added to the target file in this commit.
+        deleted: set
+            Msgids deleted from the target file in this commit.
+
+        Returns
+        -------
+        pairs: dictionary
+            {added msgid: deleted msgid}
+        """
+        if self.modify_threshold is None:
+            return {}
+
+        # Only pair messages that are new in this commit with messages that were
+        # deleted in this commit, moved messages are both added and deleted
+        new_msgs = [
+            msgid
+            for msgid in added - deleted
+            if locale in commits.get(msgid, {})
+            and commits[msgid][locale]["ft"] == timestamp
+            and "previous" not in commits[msgid][locale]
+        ]
+        old_msgs = [
+            msgid
+            for msgid in deleted - added
+            if locale in commits.get(msgid, {})
+            and commits[msgid][locale]["lt"] == timestamp
+        ]
+        if not new_msgs or not old_msgs:
+            return {}
+
+        index = ShingleIndex()
+        for msgid in old_msgs:
+            index.add(msgid, msgid)
+
+        candidates = []
+        for msgid in new_msgs:
+            for score, old in index.query(msgid, threshold=self.modify_threshold):
+                candidates.append((score, msgid, old))
+
+        # Greedily pair the most similar messages first
+        candidates.sort(key=lambda pair: (-pair[0], pair[1], pair[2]))
+        pairs = {}
+        paired = set()
+        for _, msgid, old in candidates:
+            if msgid in pairs or old in paired:
+                continue
+            pairs[msgid] = old
+            paired.add(old)
+
+        for msgid, old in pairs.items():
+            entry = commits[msgid][locale]
+            old_entry = commits[old].pop(locale)
+            if not commits[old]:
+                del commits[old]
+
+            # Drop the "deleted" mark of the old msgid from its history
+            entry["history"] = old_entry["history"][:-1] + entry["history"]
+            entry["ft"] = old_entry["ft"]
+            entry["previous"] = old
+            self.trim_history(entry)
+
+        return pairs
+
+    def get_path(self, fname):
+        """
+        Get the shared Path object of a target file name.
+        """
+        key = str(fname)
+        if key not in self._paths:
+            self._paths[key] = Path(fname)
+        return self._paths[key]
+
     def parse_line(self, line):
         """
         Helper function to parse one line from changes of the target file
@@ -183,7 +340,9 @@ class MsgReader(BaseReader):
                         "lt": timestamp of the last commit (float),
                         "history": [
                             (timestamp (float), translation)
-                        ]
+                        ],
+                        "previous": msgid this message was modified from,
+                            only for modified messages
                     }
                 }
             }
@@ -193,12 +352,16 @@ class MsgReader(BaseReader):
         # Iterate through commits from the first to the last
         if self.use_cache:
             commits = self.cache.load_cache()
-            history = list(repo.iter_commits(since=self.cache.latest_date))
+            history = list(repo.iter_commits(since=self.cache.since()))
         else:
             commits = {}
             history = list(repo.iter_commits())
 
         history.reverse()
+        # Each commit is applied as the diff from the commit before it, so the
+        # first commit since the cache is diffed from its parent
+        if self.use_cache and history and history[0].parents:
+            history.insert(0, history[0].parents[0])
         history.append(repo.head.commit)
 
         for idx, commit in enumerate(history[:-1]):
@@ -215,6 +378,13 @@ class MsgReader(BaseReader):
 
                     lines = s.split("\n")
 
+                    # Put content into the datastructure
+                    fname = self.get_path(item.b_path)
+                    locale = self.parse_lang(item.b_path)
+
+                    # Track the msgids added and deleted in this commit
+                    added, deleted = set(), set()
+
                     for line in lines:
                         content, status, kind = self.parse_line(line)
 
@@ -226,14 +396,15 @@ class MsgReader(BaseReader):
                         if kind == "msgid":
                             msgid = content
 
-                        # Put content into the datastructure
-                        fname = item.b_path
-                        locale = self.parse_lang(item.b_path)
+                            if status == "add":
+                                added.add(content)
+                            elif status == "del":
+                                deleted.add(content)
 
                         commits = self.modify_commits(
                             commits,
                             timestamp,
-                            Path(fname),
+                            fname,
                             locale,
                             msgid,
                             content,
@@ -241,6 +412,9 @@ class MsgReader(BaseReader):
                             kind,
                         )
 
+                    # Record edited source messages as modifications
+                    self.pair_modifications(commits, timestamp, locale, added, deleted)
+
         if self.use_cache:
             self.cache.write_cache(commits)
 
@@ -252,3 +426,61 @@ class MsgReader(BaseReader):
         """
         lang = os.path.basename(os.path.dirname(filename))
         return lang
+
+    def export_history(self, commits):
+        """
+        Export the commit history as a NumPy structured array with one row per
+        commit of each message in each locale, for vectorized analysis. Messages,
+        locales and translations are stored as categorical codes into lookup
+        tables.
+
+        Parameters
+        ----------
+        commits: dictionary
+            Commit history organized as returned by parse_history.
+
+        Returns
+        -------
+        records: structured array
+            Fields "msg" (int32), "locale" (int32), "timestamp" (float64) and
+            "translation" (int32).
+        tables: dictionary
+            {"msg": [...], "locale": [...], "translation": [...]}, the value of
+            each code of the categorical fields.
+        """
+        np = require_numpy()
+
+        entries = [
+            (msg, locale, entry["history"])
+            for msg, files in commits.items()
+            for locale, entry in files.items()
+        ]
+        histories = [history for _, _, history in entries]
+
+        n_entries = len(entries)
+        counts = np.fromiter(map(len, histories), dtype=np.intp, count=n_entries)
+        size = int(counts.sum())
+
+        msg_table, lang_table, text_table = {}, {}, {}
+        msgs = encode((msg for msg, _, _ in entries), msg_table, n_entries)
+        locales = encode((lang for _, lang, _ in entries), lang_table, n_entries)
+
+        # History items are (timestamp, translation)
+        items = list(chain.from_iterable(histories))
+        timestamps = np.fromiter((ts for ts, _ in items), np.float64, size)
+        translations = encode((text for _, text in items), text_table, size)
+
+        records = to_records(
+            {
+                "msg": np.repeat(msgs, counts),
+                "locale": np.repeat(locales, counts),
+                "timestamp": timestamps,
+                "translation": translations,
+            }
+        )
+        tables = {
+            "msg": list(msg_table),
+            "locale": list(lang_table),
+            "translation": list(text_table),
+        }
+        return records, tables
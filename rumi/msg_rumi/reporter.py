@@ -15,10 +15,32 @@ Reporter for message-based translation monitoring
 
 import os
 import json
+import heapq
+import shutil
+import zipfile
+import tempfile
 import textwrap
 
 from pathlib import Path
-from tabulate import tabulate
+from concurrent.futures import ThreadPoolExecutor
+from rumi.msg_rumi.memory import EMPTY_MSGS
+from rumi.render import print_table
+from rumi.writers import stats_rows, write_rows
+
+
+# Status codes of a message in a locale
+SOURCE = "s"
+DELETED = "d"
+OPEN = "o"
+UPDATED = "u"
+COMPLETED = "c"
+MISSING = "-"
+
+# Translation of a deleted message
+DELETED_MSGS = {"deleted", '"deleted"'}
+
+# Buffer size of the translation needs files
+WRITE_BUFFER = 1 << 16
 
 
 ##########################################################################
@@ -59,7 +81,94 @@ class MsgReporter:
     translated messages back into the po files.
     """
 
-    def get_stats(self, commits, src_lang):
+    def get_status(self, commits, src_lang):
+        """
+        Compute the status of every message in every locale in a single pass over
+        the commit history, to be shared by get_stats and get_details.
+
+        Parameters
+        ----------
+        commits: dictionary
+            {
+                message: {
+                    locale: {
+                        "filename": name of the file that contains target message,
+                        "ft": timestamp of the first commit (float),
+                        "lt": timestamp of the last commit (float),
+                        "history": [
+                            (timestamp (float), translation)
+                        ]
+                    }
+                }
+            }
+        src_lang: string
+            Source language as set up with lingui.js.
+
+        Returns
+        -------
+        status: dictionary
+            {
+                "locales": [locale],
+                "msgs": {
+                    message: (word count, status vector)
+                }
+            }
+            The status vector is a string with one status code per locale, in
+            the order of "locales": SOURCE, DELETED, OPEN, UPDATED, COMPLETED,
+            or MISSING if the message is not in the locale or deleted from the
+            source.
+        """
+        # Locales in the order they are first seen
+        locales = {}
+        msgs = {}
+
+        for msg in commits:
+
+            files = commits[msg]
+            # Messages only found in target languages have nothing to translate
+            if src_lang not in files:
+                continue
+            src_lt = files[src_lang]["lt"]
+            # Current message is the last item in its history
+            deleted = files[src_lang]["history"][-1][-1] in DELETED_MSGS
+
+            for locale in files:
+                if locale not in locales:
+                    locales[locale] = len(locales)
+
+            codes = [MISSING] * len(locales)
+
+            for locale in files:
+
+                entry = files[locale]
+
+                if locale == src_lang:
+                    code = DELETED if deleted else SOURCE
+                elif deleted:
+                    # Deleted messages have nothing left to translate
+                    code = MISSING
+
+                # Determine status based on target message's last commit time
+                elif src_lt < entry["lt"]:
+                    code = COMPLETED
+                elif self.is_modified(entry):
+                    # Edited source message with the old translation available
+                    code = UPDATED
+                elif src_lt == entry["lt"]:
+                    # Initially lingui.js add in msgstr "" for all messages, while
+                    # translations committed with the source are completed
+                    translation = entry["history"][-1][-1]
+                    code = OPEN if translation in EMPTY_MSGS else COMPLETED
+                else:
+                    code = UPDATED
+
+                codes[locales[locale]] = code
+
+            msgs[msg] = (self.word_count(msg), "".join(codes))
+
+        return {"locales": list(locales), "msgs": msgs}
+
+    def get_stats(self, commits, src_lang, status=None):
         """
         Get the translation stats of Total (number of items to be translated),
         Open (hasn't been translated), Updated (has been changed since translation),
@@ -80,6 +189,10 @@ class MsgReporter:
                     }
                 }
             }
+        src_lang: string
+            Source language as set up with lingui.js.
+        status: dictionary, default: None
+            Status computed by get_status, computed from commits if not specified.
 
         Returns
         -------
@@ -93,42 +206,29 @@ class MsgReporter:
                 }
             }
         """
-        stats = {}
+        if status is None:
+            status = self.get_status(commits, src_lang)
 
-        for msg in commits:
-
-            src_lt = commits[msg][src_lang]["lt"]
-
-            for locale in commits[msg]:
-
-                if not (locale in stats):
-                    stats[locale] = {
-                        "total": 0,
-                        "open": 0,
-                        "updated": 0,
-                        "completed": 0,
-                    }
-
-                # Track locale total #messages
-                stats[locale]["total"] += 1
+        # Status vectors of messages first seen before a locale are shorter,
+        # pad them so that each column holds the codes of one locale
+        width = len(status["locales"])
+        vectors = [
+            vector.ljust(width, MISSING) for _, vector in status["msgs"].values()
+        ]
 
-                if locale == src_lang:
-                    continue
-
-                # Determin status based on target message's last commit time
-                tgt_lt = commits[msg][locale]["lt"]
-
-                if src_lt < tgt_lt:
-                    stats[locale]["completed"] += 1
-                elif src_lt == tgt_lt:
-                    # Initially lingui.js add in msgstr "" for all messages
-                    stats[locale]["open"] += 1
-                else:
-                    stats[locale]["updated"] += 1
+        stats = {}
+        for locale, column in zip(status["locales"], zip(*vectors)):
+            column = "".join(column)
+            stats[locale] = {
+                "total": len(column) - column.count(MISSING),
+                "open": column.count(OPEN),
+                "updated": column.count(UPDATED),
+                "completed": column.count(COMPLETED),
+            }
 
         return stats
 
-    def get_details(self, commits, src_lang):
+    def get_details(self, commits, src_lang, memory=None, threshold=0.7, status=None):
         """
         Get the details of translation work needed for each target language.
 
@@ -147,6 +247,15 @@ class MsgReporter:
                     }
                 }
             }
+        src_lang: string
+            Source language as set up with lingui.js.
+        memory: TranslationMemory, default: None
+            Translation memory to suggest translations for the open messages of
+            the target languages. If not specified, no suggestions are made.
+        threshold: float, default: 0.7
+            Minimum similarity of the source messages of the suggestions.
+        status: dictionary, default: None
+            Status computed by get_status, computed from commits if not specified.
 
         Returns
         -------
@@ -155,37 +264,62 @@ class MsgReporter:
                 locale: {
                     "open": int,
                     "msgs": list
-                    "wc": int
+                    "wc": int,
+                    "suggestions": {msg: list}, only if memory is specified
                 }
             }
         """
-        details = {}
-
-        for msg in commits:
+        if status is None:
+            status = self.get_status(commits, src_lang)
 
-            src_lt = commits[msg][src_lang]["lt"]
+        details = {}
+        columns = []
+        for locale in status["locales"]:
+            details[locale] = {"open": 0, "msgs": [], "wc": 0}
+            columns.append(details[locale])
+
+        for msg, (wc, vector) in status["msgs"].items():
+            for detail, code in zip(columns, vector):
+                # Live source messages and open target messages need translation
+                if code == SOURCE or code == OPEN:
+                    detail["open"] += 1
+                    detail["msgs"].append(msg)
+                    detail["wc"] += wc
+
+        if memory is not None:
+            for locale in details:
+                if locale == src_lang:
+                    continue
 
-            for locale in commits[msg]:
+                suggestions = {}
+                for msg in details[locale]["msgs"]:
+                    found = memory.suggest(msg, locale, threshold=threshold)
+                    if found:
+                        suggestions[msg] = found
+                details[locale]["suggestions"] = suggestions
 
-                if not (locale in details):
-                    details[locale] = {"open": 0, "msgs": [], "wc": 0}
+        return details
 
-                # Current message is the last item in its history
-                curr_msg = commits[msg][locale]["history"][-1][-1]
+    def word_count(self, msg):
+        """
+        Count the words of a message, without its surrounding quotes.
+        """
+        msg = msg.strip()
+        if len(msg) > 1 and msg.startswith('"') and msg.endswith('"'):
+            msg = msg[1:-1]
+        return len(msg.split())
 
-                tgt_lt = commits[msg][locale]["lt"]
-                if (
-                    # Ignore deprecated messages
-                    (locale == src_lang and curr_msg != "deleted")
-                    or
-                    # Case when initial msgstr "" is added by lingui.js
-                    (locale != src_lang and src_lt == tgt_lt)
-                ):
-                    details[locale]["open"] += 1
-                    details[locale]["msgs"].append(msg)
-                    details[locale]["wc"] += len(" ".split(msg))
+    def is_modified(self, entry):
+        """
+        Check if a target message was modified from an edited source message, and
+        the translation of the original message is available in its history.
+        """
+        if "previous" not in entry:
+            return False
 
-        return details
+        return any(
+            translation not in EMPTY_MSGS for _, translation in entry["history"][:-1]
+        )
 
     def print_stats(self, stats, dump_path=""):
         """
@@ -215,13 +349,7 @@ class MsgReporter:
                 [lang, stat["total"], stat["open"], stat["updated"], stat["completed"]]
             )
 
-        print(
-            tabulate(
-                data,
-                headers=["Language", "Total", "Open", "Updated", "Completed"],
-                tablefmt="orgtbl",
-            )
-        )
+        print_table(data, headers=["Language", "Total", "Open", "Updated", "Completed"])
 
         if dump_path != "":
             with open(Path(dump_path) / "translation_stats.json", "w+") as outfile:
@@ -261,7 +389,7 @@ class MsgReporter:
         print("Translation coverage {}%".format(str(score)))
         return score
 
-    def print_details(self, details, dump_path=""):
+    def print_details(self, details, dump_path="", top=None):
         """
         Print out the details of messages needing translations for each language
         and provide word count.
@@ -278,18 +406,26 @@ class MsgReporter:
             }
         dump_path: string
             Path to save the json file. Default to "".
+        top: int or None, default: None
+            Number of messages to print for each language, picking those with the
+            largest word count. If not specified, all messages are printed.
         """
         for lang in details:
 
             detail = details[lang]
 
             print("-" * 70)
-            print(lang, "Open:", detail["wc"])
+            print(lang, "Open:", detail["open"])
+
+            msgs = detail["msgs"]
+            # Keep a heap of the longest messages rather than sorting all of them
+            if top is not None:
+                msgs = heapq.nlargest(top, msgs, key=self.word_count)
 
-            if len(detail["msgs"]) > 0:
+            if len(msgs) > 0:
                 # Format msg with textwrap
-                fmt_msgs = ["\n".join(textwrap.wrap(s)) for s in detail["msgs"]]
-                print("\n".join(fmt_msgs))
+                fmt_msgs = ["\n".join(textwrap.wrap(s)) for s in msgs]
+                print("\n".join(fmt_msgs), flush=True)
 
         print("-" * 70)
 
@@ -297,10 +433,73 @@ class MsgReporter:
             with open(Path(dump_path) / "translation_details.json", "w+") as outfile:
                 json.dump(details, outfile, indent=4)
 
+    def dump_stats(self, stats, dump_path=".", format="jsonl"):
+        """
+        Write the translation stats with one row per locale.
+
+        Parameters
+        ----------
+        stats: dictionary
+            Stats from get_stats.
+        dump_path: string, default: "."
+            Path to the directory of the report.
+        format: string, choices: "jsonl", "csv", default: "jsonl"
+            Format of the report.
+
+        Returns
+        -------
+        filename: Path
+            Path to the written translation_stats.<format> file.
+        """
+        filename = Path(dump_path) / "translation_stats.{}".format(format)
+        write_rows(stats_rows(stats), filename, format=format)
+        return filename
+
+    def dump_details(self, details, dump_path=".", format="jsonl"):
+        """
+        Stream the messages needing translation into a report, with one row per
+        message of each locale and its suggestions if any.
+
+        Parameters
+        ----------
+        details: dictionary
+            Details from get_details.
+        dump_path: string, default: "."
+            Path to the directory of the report.
+        format: string, choices: "jsonl", "csv", default: "jsonl"
+            Format of the report.
+
+        Returns
+        -------
+        filename: Path
+            Path to the written translation_details.<format> file.
+        """
+        fields = ["locale", "msg"]
+        if any("suggestions" in detail for detail in details.values()):
+            fields.append("suggestions")
+
+        filename = Path(dump_path) / "translation_details.{}".format(format)
+        write_rows(self.detail_rows(details), filename, format=format, fields=fields)
+        return filename
+
+    def detail_rows(self, details):
+        """
+        Generate the rows of dump_details, one per message of each locale.
+        """
+        for locale, detail in details.items():
+            suggestions = detail.get("suggestions")
+            for msg in detail["msgs"]:
+                row = {"locale": locale, "msg": msg}
+                if suggestions is not None:
+                    row["suggestions"] = suggestions.get(msg, [])
+                yield row
+
     def download_needs(self, details, lang, path="."):
         """
         Writes the msgid that needs to be translated into a .txt file for each
-        language.
+        language. If the details contain suggestions from a translation memory,
+        the msgstr of an exact match is filled in, and the other suggestions are
+        written as comments above the msgid.
 
         Parameters
         ----------
@@ -312,79 +511,258 @@ class MsgReporter:
                     "wc": int
                 }
             }
+        lang: string
+            Language to write the translation needs of.
         path: string, default: "./"
             Path to where the .txt file are wrote to. Default writing to the
             current path.
+
+        Returns
+        -------
+        filename: string
+            Path to the written .txt file.
         """
+        filename = os.path.join(path, self.needs_filename(lang))
+        print("Creating file {}".format(filename))
 
-        detail = details[lang]
+        with open(filename, "w+", buffering=WRITE_BUFFER) as f:
+            f.writelines(self.format_needs(details[lang], lang))
 
-        filename = os.path.join(path, "{}_needing_translation.txt".format(lang))
-        print("Creating file {}".format(filename))
+        return filename
 
-        with open(filename, "w+") as f:
-            header = "Language: {}, {} words needing translation \n".format(
-                lang, detail["wc"]
+    def download_all_needs(
+        self, details, langs=None, path=".", archive="", workers=None
+    ):
+        """
+        Writes the msgid that needs to be translated for several languages at
+        once, either into a .txt file for each language or into a single zip
+        archive. The files are formatted concurrently in a thread pool.
+
+        Parameters
+        ----------
+        details: dictionary
+            {
+                locale: {
+                    "open": int,
+                    "msgs": list
+                    "wc": int
+                }
+            }
+        langs: list, default: None
+            Languages to write the translation needs of. If not specified, all
+            languages in details are written.
+        path: string, default: "./"
+            Path to where the .txt files or the archive are wrote to. Default
+            writing to the current path.
+        archive: string, default: ""
+            Name of a zip archive to hold the .txt files of all languages. If not
+            specified, a .txt file is written for each language.
+        workers: int, default: None
+            Maximum number of threads, as used by ThreadPoolExecutor by default.
+
+        Returns
+        -------
+        filenames: list
+            Paths to the written .txt files, or a list with the path to the
+            archive.
+        """
+        if langs is None:
+            langs = list(details)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            if not archive:
+                n_langs = len(langs)
+                filenames = executor.map(
+                    self.download_needs, [details] * n_langs, langs, [path] * n_langs
+                )
+                return list(filenames)
+
+            filename = os.path.join(path, archive)
+            print("Creating archive {}".format(filename))
+
+            # Format the languages concurrently, and add them to the archive
+            # from a single thread as zipfile is not thread safe for writing
+            contents = executor.map(
+                lambda lang: "".join(self.format_needs(details[lang], lang)), langs
             )
-            f.write(header)
+            with zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as archive_file:
+                for lang, content in zip(langs, contents):
+                    archive_file.writestr(self.needs_filename(lang), content)
 
-            for msg in detail["msgs"]:
-                f.write("msgid " + msg + "\n")
-                f.write('msgstr ""\n')
-                f.write("\n")
+        return [filename]
+
+    def needs_filename(self, lang):
+        """
+        Name of the .txt file of the translation needs of a language.
+        """
+        return "{}_needing_translation.txt".format(lang)
 
-    def insert_translations(self, file, po_file):
+    def format_needs(self, detail, lang):
+        """
+        Generate the lines of the translation needs of a language.
+
+        Parameters
+        ----------
+        detail: dictionary
+            {
+                "open": int,
+                "msgs": list
+                "wc": int
+            }
+        lang: string
+            Language of the translation needs.
+        """
+        suggestions = detail.get("suggestions", {})
+
+        yield "Language: {}, {} words needing translation \n".format(lang, detail["wc"])
+
+        for msg in detail["msgs"]:
+            msgstr = '""'
+            for suggestion in suggestions.get(msg, []):
+                if suggestion["exact"] and msgstr == '""':
+                    msgstr = suggestion["msgstr"]
+                    continue
+                yield "# suggestion ({}%): {} => {}\n".format(
+                    round(suggestion["score"] * 100, 1),
+                    suggestion["msgid"],
+                    suggestion["msgstr"],
+                )
+            yield "msgid {}\nmsgstr {}\n\n".format(msg, msgstr)
+
+    def insert_translations(self, file, po_file, in_place=False):
         """
         Combine new translations together with other translations in the po file
         of a language and generate a new file locally.
 
         Parameters
-        ----------`
+        ----------
         file: string
             Path to the file that contains the new translations.
         po_file: string
             Path to the po file as used with lingui.js.
+        in_place: bool, default: False
+            Whether to rewrite the po file in place. If False, the combined
+            translations are written to "inserted_<file name>" next to file.
+
+        Returns
+        -------
+        new_file: string
+            Path to the file with the combined translations.
+        """
+        if in_place:
+            new_file = po_file
+        else:
+            new_file = os.path.join(
+                os.path.dirname(file), "inserted_" + os.path.basename(file)
+            )
+
+        insert = self.read_translations([file])
+        self.merge_translations(po_file, insert, new_file)
+        return new_file
+
+    def insert_all_translations(self, translations, workers=None):
+        """
+        Insert new translations into the po files of many languages at once. Each
+        po file is rewritten in place, and the po files are merged concurrently
+        in a thread pool.
+
+        Parameters
+        ----------
+        translations: dictionary
+            {
+                po_file: [files that contain the new translations]
+            }
+            When several files contain a translation of the same msgid, the one
+            in the latter file is inserted.
+        workers: int, default: None
+            Maximum number of threads, as used by ThreadPoolExecutor by default.
+
+        Returns
+        -------
+        po_files: list
+            Paths to the rewritten po files.
+        """
+
+        def insert_all(po_file):
+            files = translations[po_file]
+            if isinstance(files, (str, os.PathLike)):
+                files = [files]
+            self.merge_translations(po_file, self.read_translations(files), po_file)
+            return po_file
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(insert_all, translations))
+
+    def read_translations(self, files):
+        """
+        Read in the msgid and msgstr to be inserted from files line by line,
+        ignoring the empty msgstr.
+
+        Returns
+        -------
+        insert: dictionary
+            {msgid: msgstr}
         """
-        # Readin msgid and msgstr to be inserted
         insert = {}
 
-        with open(file, "r+") as f_insert:
+        for file in files:
+            with open(file, "r") as f_insert:
 
-            for line in f_insert.readlines():
+                for line in f_insert:
 
-                line = line.strip()
+                    line = line.strip()
 
-                if line.startswith("msgid "):
-                    msgid = line.replace("msgid ", "")
+                    if line.startswith("msgid "):
+                        msgid = line.replace("msgid ", "")
 
-                if line.startswith("msgstr "):
-                    msgstr = line.replace("msgstr ", "")
-                    if msgstr != '""':
-                        insert[msgid] = msgstr
+                    if line.startswith("msgstr "):
+                        msgstr = line.replace("msgstr ", "")
+                        if msgstr != '""':
+                            insert[msgid] = msgstr
 
-        # Combine old and insert translations and write to a new file
-        new_file = os.path.join(
-            os.path.dirname(file), "inserted_" + os.path.basename(file)
-        )
-        f_new = open(new_file, "w+")
+        return insert
 
-        with open(po_file, "r+") as f_old:
+    def merge_translations(self, po_file, insert, new_file):
+        """
+        Stream the po file line by line, replace the msgstr of the msgid in insert
+        and write the result to new_file. The result is written to a temporary
+        file first, and moved to new_file once complete, so that new_file can be
+        the po file itself.
 
-            for line in f_old.readlines():
+        Parameters
+        ----------
+        po_file: string
+            Path to the po file as used with lingui.js.
+        insert: dictionary
+            {msgid: msgstr}
+        new_file: string
+            Path to write the combined translations to.
+        """
+        dirname = os.path.dirname(os.path.abspath(new_file))
+        fd, tmp_file = tempfile.mkstemp(dir=dirname, suffix=".tmp")
 
-                # Write line of msgid as is and track msgid
-                if line.startswith("msgid "):
-                    msgid = line.strip().replace("msgid ", "")
-                    f_new.write(line)
+        try:
+            with open(po_file, "r") as f_old, os.fdopen(
+                fd, "w", buffering=WRITE_BUFFER
+            ) as f_new:
+
+                for line in f_old:
+
+                    # Write line of msgid as is and track msgid
+                    if line.startswith("msgid "):
+                        msgid = line.strip().replace("msgid ", "")
+                        f_new.write(line)
+
+                    # Search for msgstr in insert, if none, write old msgstr
+                    elif line.startswith("msgstr ") and msgid in insert:
+                        f_new.write("msgstr " + insert[msgid] + "\n")
 
-                # Search for msgstr in insert, if none, write old msgstr
-                elif line.startswith("msgstr "):
-                    if msgid in insert:
-                        msgstr = insert[msgid]
-                        f_new.write("msgstr " + msgstr + "\n")
                     else:
                         f_new.write(line)
-                else:
-                    f_new.write(line)
 
-        f_new.close()
+            # Keep the permissions of the po file rather than the temporary file
+            shutil.copymode(po_file, tmp_file)
+            os.replace(tmp_file, new_file)
+        except BaseException:
+            os.remove(tmp_file)
+            raise
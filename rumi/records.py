@@ -0,0 +1,82 @@
+# rumi.records
+# NumPy structured-array export of the parsed commit history
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+NumPy structured-array export of the parsed commit history
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+##########################################################################
+# Helper Functions
+##########################################################################
+
+
+def require_numpy():
+    """
+    Get the numpy module, raising an exception if it is not installed.
+    """
+    if np is None:
+        raise Exception("Please install numpy to export the commit history")
+    return np
+
+
+def encode(values, table, count=-1):
+    """
+    Encode categorical values into integer codes, adding the unseen values to
+    the lookup table.
+
+    Parameters
+    ----------
+    values: iterable
+        Values to encode.
+    table: dictionary
+        {value: code}, updated in place with the unseen values.
+    count: int, default: -1
+        Number of values if known, to allocate the codes at once.
+
+    Returns
+    -------
+    codes: array
+        int32 codes of the values.
+    """
+    return np.fromiter(
+        (table.setdefault(value, len(table)) for value in values),
+        dtype=np.int32,
+        count=count,
+    )
+
+
+def to_records(columns):
+    """
+    Assemble columns of the same length into a structured array.
+
+    Parameters
+    ----------
+    columns: dictionary
+        {name: 1-D array}, in the order of the fields.
+
+    Returns
+    -------
+    records: structured array
+        One field for each column, with the dtype of the column.
+    """
+    dtype = [(name, column.dtype) for name, column in columns.items()]
+    size = len(next(iter(columns.values()))) if columns else 0
+
+    records = np.empty(size, dtype=dtype)
+    for name, column in columns.items():
+        records[name] = column
+    return records
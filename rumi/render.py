@@ -0,0 +1,137 @@
+# rumi.render
+# Fixed-width terminal renderer for the reports
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Fixed-width terminal renderer for the reports
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import sys
+
+
+# Extra width of each column over its header, as in the orgtbl format of tabulate
+MIN_PADDING = 2
+
+
+##########################################################################
+# Helper Functions
+##########################################################################
+
+
+def is_number(value):
+    """
+    Check if a cell holds a number, which is aligned to the right.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def measure(rows, headers, numeric=None):
+    """
+    Format the cells of the rows as strings and compute the width and alignment
+    of each column in a single pass.
+
+    Parameters
+    ----------
+    rows: iterable
+        Rows of the table, as sequences of the same length as headers.
+    headers: list
+        Header of each column.
+    numeric: list or None, default: None
+        Whether each column is aligned to the right. If not specified, columns
+        that only hold numbers are aligned to the right.
+
+    Returns
+    -------
+    cells: list
+        Rows of the table with the cells as strings.
+    widths: list
+        Width of each column.
+    numeric: list
+        Whether each column only holds numbers.
+    """
+    widths = [len(header) + MIN_PADDING for header in headers]
+    infer = numeric is None
+    # Columns without rows are aligned to the left
+    numeric = [False] * len(headers) if infer else list(numeric)
+
+    cells = []
+    for row in rows:
+        if infer and not cells:
+            numeric = [True] * len(headers)
+
+        line = []
+        for idx, value in enumerate(row):
+            if infer:
+                numeric[idx] = numeric[idx] and is_number(value)
+            text = str(value)
+            if len(text) > widths[idx]:
+                widths[idx] = len(text)
+            line.append(text)
+        cells.append(line)
+
+    return cells, widths, numeric
+
+
+def format_row(cells, widths, numeric):
+    """
+    Format a row of cells as a line of the table.
+    """
+    return "| {} |".format(
+        " | ".join(
+            text.rjust(width) if right else text.ljust(width)
+            for text, width, right in zip(cells, widths, numeric)
+        )
+    )
+
+
+def print_table(rows, headers, page_size=None, numeric=None, file=None):
+    """
+    Print the rows as a fixed-width table in the orgtbl format, e.g.:
+        | Language   |   Total |
+        |------------+---------|
+        | fr         |       2 |
+
+    Every row is formatted first, in a single pass that also computes the widths
+    of the columns. The lines are then written and flushed page by page.
+
+    Parameters
+    ----------
+    rows: iterable
+        Rows of the table, as sequences of the same length as headers.
+    headers: list
+        Header of each column.
+    page_size: int or None, default: None
+        Number of rows of each page, each page starting with the header. If not
+        specified, the rows are printed in a single page.
+    numeric: list or None, default: None
+        Whether each column is aligned to the right. If not specified, columns
+        that only hold numbers are aligned to the right.
+    file: object or None, default: None
+        File to print to, default to sys.stdout.
+    """
+    if file is None:
+        file = sys.stdout
+
+    cells, widths, numeric = measure(rows, headers, numeric=numeric)
+    header = [
+        format_row(headers, widths, numeric),
+        "|{}|".format("+".join("-" * (width + 2) for width in widths)),
+    ]
+
+    if not page_size:
+        page_size = max(len(cells), 1)
+
+    for start in range(0, max(len(cells), 1), page_size):
+        page = cells[start:start + page_size]
+        lines = header + [format_row(row, widths, numeric) for row in page]
+        if start > 0:
+            lines.insert(0, "")
+        file.write("\n".join(lines) + "\n")
+        file.flush()
@@ -0,0 +1,137 @@
+# rumi.writers
+# Streaming JSON Lines and CSV writers for the reports
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Streaming JSON Lines and CSV writers for the reports
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import csv
+import json
+
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+# Buffer size of the report files
+WRITE_BUFFER = 1 << 16
+
+# Formats of the report files
+FORMATS = ("jsonl", "csv")
+
+
+##########################################################################
+# Helper Functions
+##########################################################################
+
+
+def dumps(row):
+    """
+    Encode a row as a line of JSON in bytes, with orjson if it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(row)
+    return json.dumps(row, ensure_ascii=False).encode("utf-8")
+
+
+def as_dict(row):
+    """
+    Get a row as a dictionary, converting named tuples such as Detail records.
+    """
+    if hasattr(row, "_asdict"):
+        return row._asdict()
+    return row
+
+
+def stats_rows(stats):
+    """
+    Flatten per-locale stats into one row per locale.
+    """
+    for locale, stat in stats.items():
+        row = {"locale": locale}
+        row.update(stat)
+        yield row
+
+
+def write_jsonl(rows, path):
+    """
+    Write the rows as one JSON object per line, returning the number of rows.
+    """
+    count = 0
+    with open(path, "wb", buffering=WRITE_BUFFER) as f:
+        for row in rows:
+            f.write(dumps(as_dict(row)))
+            f.write(b"\n")
+            count += 1
+    return count
+
+
+def write_csv(rows, path, fields=None):
+    """
+    Write the rows as CSV with a header of the fields, by default those of the
+    first row, nested values being encoded as JSON, returning the number of rows.
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
+        writer = csv.writer(f)
+        if fields is not None:
+            fields = list(fields)
+            writer.writerow(fields)
+
+        for row in rows:
+            row = as_dict(row)
+            if fields is None:
+                fields = list(row)
+                writer.writerow(fields)
+
+            values = []
+            for field in fields:
+                value = row.get(field, "")
+                if isinstance(value, (list, dict)):
+                    value = dumps(value).decode("utf-8")
+                values.append(value)
+
+            writer.writerow(values)
+            count += 1
+    return count
+
+
+def write_rows(rows, path, format="jsonl", fields=None):
+    """
+    Write the rows of a report one by one, so that the rows can be produced by
+    a generator and the report reaches disk in constant memory.
+
+    Parameters
+    ----------
+    rows: iterable
+        Dictionaries or named tuples with the same fields.
+    path: string or Path object
+        Path to the report file.
+    format: string, choices: "jsonl", "csv", default: "jsonl"
+        "jsonl" writes one JSON object per line, and "csv" writes a header with
+        the fields of the first row.
+    fields: list or None, default: None
+        Header of the "csv" format, so that a report without rows still has a
+        header. If not specified, the fields of the first row are used.
+
+    Returns
+    -------
+    count: int
+        Number of rows written.
+    """
+    if format == "jsonl":
+        return write_jsonl(rows, Path(path))
+    elif format == "csv":
+        return write_csv(rows, Path(path), fields=fields)
+    raise Exception("Please specify format from {}".format(", ".join(FORMATS)))
@@ -18,7 +18,7 @@ import git
 import pytest
 
 from pathlib import Path
-from rumi.base_reader import BaseReader
+from rumi.base_reader import BaseReader, PathIndex
 
 
 ##########################################################################
@@ -89,6 +89,80 @@ class TestBaseReader:
         # are identified as reader.targets
         assert reader.targets == {Path("content") / "correct.c"}
 
+    @pytest.mark.parametrize(
+        "discover, want",
+        [
+            ("walk", {"correct.c", "staged.c", "untracked.c"}),
+            ("index", {"correct.c", "staged.c"}),
+            ("tree", {"correct.c"}),
+        ],
+    )
+    def test_discover_targets(self, tmpdir, discover, want):
+        """
+        Assert targets can be discovered from the git index or the branch tree,
+        which ignore the files that git does not track.
+        """
+        repo_name = self.generate_fixtures(tmpdir)
+        repo = git.Repo(tmpdir / repo_name)
+
+        content_dir = tmpdir / repo_name / "content"
+        (content_dir / "staged.c").write_text("", encoding="utf8")
+        repo.git.add("content/staged.c")
+        (content_dir / "untracked.c").write_text("", encoding="utf8")
+        (content_dir / ".hidden.c").write_text("", encoding="utf8")
+
+        reader = BaseReader(
+            content_paths=["content"],
+            extensions=[".c"],
+            repo_path=str(tmpdir / repo_name),
+            branch="test",
+            discover=discover,
+        )
+
+        assert reader.targets == {Path("content") / name for name in want}
+
+        # Files outside the content paths are listed the same way
+        reader.add_target("initial_file.txt")
+        assert Path("initial_file.txt") in reader.targets
+
+    @pytest.mark.parametrize("discover", ["walk", "index", "tree"])
+    def test_rumiignore(self, tmpdir, discover):
+        """
+        Assert files and directories in .rumiignore are not identified as target.
+        """
+        repo_name = self.generate_fixtures(tmpdir)
+        repo_path = tmpdir / repo_name
+
+        (repo_path / ".rumiignore").write_text(
+            "generated/\n*.skip.c\n", encoding="utf8"
+        )
+        generated_dir = repo_path / "content" / "generated"
+        generated_dir.mkdir()
+        (generated_dir / "page.c").write_text("", encoding="utf8")
+        (repo_path / "content" / "page.skip.c").write_text("", encoding="utf8")
+
+        repo = git.Repo(repo_path)
+        repo.git.add(A=True)
+        repo.git.commit(m="adding ignored files")
+
+        reader = BaseReader(
+            content_paths=["content"],
+            extensions=[".c"],
+            repo_path=str(repo_path),
+            branch="test",
+            discover=discover,
+        )
+
+        assert reader.targets == {Path("content") / "correct.c"}
+
+    def test_discover_fail(self, tmpdir):
+        """
+        Assert an unknown discover mode raises exception.
+        """
+        repo_name = self.generate_fixtures(tmpdir)
+        with pytest.raises(Exception, match=r"Please specify discover"):
+            BaseReader(repo_path=str(tmpdir / repo_name), discover="find")
+
     def test_validate_repo_path(self, tmpdir):
         """
         Assert invalid repo_path raises exception.
@@ -115,3 +189,78 @@ class TestBaseReader:
 
         repo = reader.get_repo()
         assert repo.active_branch.name == "test"
+
+    def test_add_del_target(self, tmpdir):
+        """
+        Assert single targets can be added from anywhere in the repository and
+        deleted by file name.
+        """
+        repo_name = self.generate_fixtures(tmpdir)
+        reader = BaseReader(
+            content_paths=["content"],
+            extensions=[".c"],
+            repo_path=str(tmpdir / repo_name),
+            branch="test",
+        )
+
+        reader.add_target("wrong.w")
+        assert reader.targets == {
+            Path("content") / "correct.c",
+            Path("content") / "wrong.w",
+        }
+
+        # Files outside the content paths are found through the repository index
+        reader.add_target("initial_file.txt")
+        assert Path("initial_file.txt") in reader.targets
+        assert reader.repo_indexed
+
+        reader.del_target("correct.c")
+        assert reader.targets == {Path("content") / "wrong.w", Path("initial_file.txt")}
+
+        with pytest.raises(Exception, match=r"Please provide a valid file name"):
+            reader.add_target("missing.c")
+        with pytest.raises(Exception, match=r"Please provide a valid file name"):
+            reader.del_target("correct.c")
+
+    def test_add_del_targets(self, tmpdir):
+        """
+        Assert targets can be added and deleted in bulk with glob patterns.
+        """
+        repo_name = self.generate_fixtures(tmpdir)
+        reader = BaseReader(
+            content_paths=["content"],
+            extensions=[".c"],
+            repo_path=str(tmpdir / repo_name),
+            branch="test",
+        )
+
+        added = reader.add_targets(["*.w", "non_content/correct.c"])
+        assert added == {
+            Path("content") / "wrong.w",
+            Path("non_content") / "wrong.w",
+            Path("non_content") / "correct.c",
+        }
+        assert len(reader.targets) == 4
+
+        deleted = reader.del_targets(["non_content/*", "wrong.w"])
+        assert deleted == added
+        assert reader.targets == {Path("content") / "correct.c"}
+
+
+class TestPathIndex:
+    def test_match(self):
+        """
+        Assert paths are matched by name, relative path and glob patterns.
+        """
+        index = PathIndex(["content/en/a.md", "content/fr/a.md", "data/b.toml"])
+
+        assert index.match("a.md") == {Path("content/en/a.md"), Path("content/fr/a.md")}
+        assert index.match("data/b.toml") == {Path("data/b.toml")}
+        assert index.match("*.toml") == {Path("data/b.toml")}
+        assert index.match("content/fr/*") == {Path("content/fr/a.md")}
+        assert index.match("c.md") == set()
+
+        index.discard("content/en/a.md")
+        assert "content/en/a.md" not in index
+        assert index.find("a.md") == {Path("content/fr/a.md")}
+        assert len(index) == 2
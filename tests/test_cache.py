@@ -0,0 +1,74 @@
+# tests.test_cache
+# Test the caches of the git history readers
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Test the caches of the git history readers
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import os
+
+from datetime import datetime as dt
+from rumi.cache import Cache
+
+
+##########################################################################
+# Cache Test Cases
+##########################################################################
+
+
+class TestCache:
+    def test_write_cache(self, tmpdir, monkeypatch):
+        """
+        Assert the latest date follows the cache just written, so that a later
+        read in the same process continues from it.
+        """
+        monkeypatch.chdir(tmpdir)
+        cache = Cache("repo", "file")
+        assert cache.latest_date == "1900-1-1 00:00:00"
+
+        commits = {"a.md": {"en": {"ft": 1.0, "lt": 1.0}}}
+        cache.write_cache(commits)
+
+        assert os.listdir(cache.cache_dir) == [cache.latest_date]
+        assert cache.load_cache() == commits
+        assert Cache("repo", "file").latest_date == cache.latest_date
+
+    def test_since(self, tmpdir, monkeypatch):
+        """
+        Assert the date of the latest cache is given to git as
+        "yyyy-mm-dd HH:MM:SS" rather than in the dashed file name format.
+        """
+        monkeypatch.chdir(tmpdir)
+        cache = Cache("repo", "file")
+        assert cache.since() == "1900-1-1 00:00:00"
+
+        cache.write_cache({})
+        since = cache.since()
+        assert since == dt.strptime(cache.latest_date, cache.date_format).strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+
+    def test_version(self, tmpdir, monkeypatch):
+        """
+        Assert caches written with another version are not loaded.
+        """
+        monkeypatch.chdir(tmpdir)
+        old = Cache("repo", "file")
+        old.write_cache({"content/en/a.md": {}})
+
+        cache = Cache("repo", "file", version=2)
+        assert cache.latest_date == "1900-1-1 00:00:00"
+        assert cache.load_cache() == {}
+
+        cache.write_cache({"a.md": {}})
+        assert Cache("repo", "file", version=2).load_cache() == {"a.md": {}}
+        # The unversioned cache ignores the subdirectory of the versioned one
+        assert Cache("repo", "file").load_cache() == {"content/en/a.md": {}}
@@ -0,0 +1,90 @@
+# tests.test_file_rumi.test_frontmatter
+# Test the front matter index for linking translations of hugo contents
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Test the front matter index for linking translations of hugo contents
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import git
+import pytest
+
+from rumi.cache import BlobCache
+from rumi.file_rumi.frontmatter import (
+    FrontMatterIndex,
+    parse_translation_key,
+    read_front_matter,
+)
+
+
+##########################################################################
+# FrontMatterIndex Test Cases
+##########################################################################
+
+
+class TestFrontMatter:
+    @pytest.mark.parametrize(
+        "content, key",
+        [
+            ("---\ntitle: About\ntranslationKey: about\n---\nbody\n", "about"),
+            ('+++\ntitle = "About"\ntranslationKey = "about"\n+++\n', "about"),
+            ('{\n  "title": "About",\n  "translationKey": "about",\n}\n', "about"),
+            ("---\ntranslationKey: 'about us'\n---\n", "about us"),
+            ("---\ntitle: About\n---\ntranslationKey: body\n", None),
+            ("translationKey: no front matter\n", None),
+            ("---\ntranslationKey: unterminated\n", None),
+            ("", None),
+        ],
+    )
+    def test_parse_translation_key(self, content, key):
+        """
+        Assert translationKey is parsed from YAML, TOML and JSON front matter only.
+        """
+        header = read_front_matter(content.splitlines())
+        assert parse_translation_key(header) == key
+
+    def test_translation_keys(self, tmpdir):
+        """
+        Assert keys are read from blobs and cached by blob SHA.
+        """
+        repo = git.Repo.init(tmpdir / "repo")
+        blob_file = tmpdir / "page.md"
+        blob_file.write_text("---\ntranslationKey: about\n---\n", encoding="utf8")
+        sha = repo.git.hash_object("-w", str(blob_file))
+
+        cache = BlobCache("repo", "file", "frontmatter", persist=False)
+        index = FrontMatterIndex(repo, cache=cache)
+
+        assert index.translation_keys({"content/en/page.md": sha}) == {
+            "content/en/page.md": "about"
+        }
+        assert cache[sha] == "about"
+
+        # Cached keys are not read again
+        cache[sha] = "cached"
+        assert index.translation_key(sha) == "cached"
+
+    def test_translation_keys_long_body(self, tmpdir):
+        """
+        Assert blobs with a body left unread do not corrupt the next blob read.
+        """
+        repo = git.Repo.init(tmpdir / "repo")
+        blobs = {}
+        for name in ["about", "contact"]:
+            blob_file = tmpdir / "{}.md".format(name)
+            body = "Lorem ipsum dolor sit amet.\n" * 2000
+            blob_file.write_text(
+                "---\ntranslationKey: {}\n---\n{}".format(name, body), encoding="utf8"
+            )
+            blobs[name] = repo.git.hash_object("-w", str(blob_file))
+
+        index = FrontMatterIndex(repo)
+        assert index.translation_keys(blobs) == {"about": "about", "contact": "contact"}
+        assert repo.odb.stream(bytes.fromhex(blobs["about"])).read().startswith(b"---")
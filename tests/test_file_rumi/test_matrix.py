@@ -0,0 +1,128 @@
+# tests.test_file_rumi.test_matrix
+# Test the vectorized status engine for file-based translation monitoring
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Test the vectorized status engine for file-based translation monitoring
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import git
+import copy
+import pytest
+
+from rumi.file_rumi.reader import FileReader
+from rumi.file_rumi.reporter import FileReporter
+
+np = pytest.importorskip("numpy")
+
+from rumi.file_rumi.matrix import StatusMatrix  # noqa: E402
+
+
+##########################################################################
+# StatusMatrix Test Cases
+##########################################################################
+
+
+@pytest.mark.usefixtures("commits_no_status", "commits_status")
+class TestStatusMatrix:
+    def test_apply(self):
+        """
+        Assert the statuses written by the matrix match the ones of set_status.
+        """
+        commits = copy.deepcopy(self.commits_no_status)
+        # Locale without commit history before set_langs
+        del commits["file.md"]["ja"]
+
+        matrix = StatusMatrix(commits, src_lang="fr", langs=["ja"])
+        matrix.apply(commits)
+
+        for lang, entry in self.commits_status["file.md"].items():
+            assert commits["file.md"][lang]["status"] == entry["status"]
+            assert matrix.status_of("file.md", lang) == entry["status"]
+
+    def test_get_sources(self):
+        """
+        Assert the earliest locale is the source, with src_lang winning ties.
+        """
+        commits = {
+            "a.md": {"en": {"ft": 3.0, "lt": 3.0}, "fr": {"ft": 3.0, "lt": 3.0}},
+            "b.md": {"en": {"ft": 2.0, "lt": 2.0}, "fr": {"ft": 1.0, "lt": 1.0}},
+            "c.md": {"en": {}, "fr": {"ft": 1.0, "lt": 1.0}},
+        }
+        matrix = StatusMatrix(commits, src_lang="fr")
+        sources = [matrix.locales[col] for col in matrix.sources]
+        assert sources == ["fr", "fr", "fr"]
+
+        matrix = StatusMatrix(commits, src_lang="en")
+        sources = [matrix.locales[col] for col in matrix.sources]
+        assert sources == ["en", "fr", "fr"]
+
+    def test_get_stats(self):
+        """
+        Assert the stats counted over the matrix match the ones of the reporter.
+        """
+        commits = copy.deepcopy(self.commits_no_status)
+        matrix = StatusMatrix(commits, src_lang="fr")
+
+        reporter = FileReporter()
+        assert reporter.get_stats({}, matrix=matrix) == reporter.get_stats(
+            self.commits_status
+        )
+
+    def test_empty(self):
+        """
+        Assert an empty commit history has no stats for the monitored locales.
+        """
+        matrix = StatusMatrix({}, langs=["fr"])
+        assert matrix.get_stats() == {
+            "fr": {"open": 0, "updated": 0, "completed": 0, "total": 0}
+        }
+
+    def test_parse_history_engine(self, tmpdir):
+        """
+        Assert both engines parse the git history into the same commit dictionary.
+        """
+        repo_path = tmpdir / "test_engine_repo"
+        repo = git.Repo.init(repo_path)
+        repo.config_writer().set_value("user", "name", "testrumi").release()
+        repo.config_writer().set_value("user", "email", "testrumiemail").release()
+
+        for day, lang in enumerate(("en", "fr", "ja"), 1):
+            content_dir = repo_path / "content" / lang
+            content_dir.ensure(dir=True)
+            (content_dir / "a.md").write_text("Line", encoding="utf8")
+            repo.git.add(A=True)
+            repo.git.commit(m=lang, date="2021-11-0{} 12:00:00".format(day))
+
+        # Source file is updated after the translations
+        (repo_path / "content" / "en" / "a.md").write_text("Line\nNew", encoding="utf8")
+        repo.git.add(A=True)
+        repo.git.commit(m="update", date="2021-11-05 12:00:00")
+
+        got = {}
+        for engine in ("python", "numpy"):
+            reader = FileReader(
+                repo_path=str(repo_path),
+                branch=repo.active_branch.name,
+                use_cache=False,
+                engine=engine,
+            )
+            got[engine] = reader.parse_history()
+
+        assert got["numpy"] == got["python"]
+        assert reader.matrix.status_of("a.md", "en") == "source"
+        assert reader.matrix.status_of("a.md", "fr") == "updated"
+
+    def test_engine_fail(self):
+        """
+        Assert an unknown engine raises an exception.
+        """
+        with pytest.raises(Exception, match="Please specify engine from"):
+            FileReader(engine="pandas")
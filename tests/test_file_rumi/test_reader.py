@@ -23,6 +23,7 @@ import shutil
 from pathlib import Path
 from datetime import datetime
 from rumi.file_rumi.reader import FileReader
+from rumi.file_rumi.reporter import FileReporter
 
 
 ##########################################################################
@@ -138,10 +139,12 @@ class TestFileReader:
             ),
         ],
     )
-    def test_parse_history(self, tmpdir, pattern, en_fname, fr_fname):
+    def test_parse_history(self, tmpdir, monkeypatch, pattern, en_fname, fr_fname):
         """
         Assert git history is correctly parsed into a commit dictionary.
         """
+        # Write the caches into the temporary directory
+        monkeypatch.chdir(tmpdir)
 
         repo_path, ts1, ts2 = self.generate_fixtures(
             tmpdir, "test_{}_repo".format(re.sub("[^a-zA-Z]+", "", pattern)), pattern
@@ -181,6 +184,58 @@ class TestFileReader:
 
         assert got == want
 
+        assert reader.status_of(en_fname) == "source"
+        assert reader.status_of(str(fr_fname)) == "completed"
+        with pytest.raises(Exception, match=r"Unable to find the status"):
+            reader.status_of(str(fr_fname).replace("fr", "ja"))
+
+    def test_parse_history_translation_key(self, tmpdir, monkeypatch):
+        """
+        Assert locales with different file names are linked by translationKey.
+        """
+        # Write the caches into the temporary directory
+        monkeypatch.chdir(tmpdir)
+        repo_path, ts1, ts2 = self.generate_fixtures(tmpdir, "test_key_repo", "folder/")
+        repo = git.Repo(repo_path)
+
+        front_matter = "---\ntranslationKey: about\n---\n"
+        about = Path(repo_path) / "content" / "en" / "about.md"
+        about.write_text(front_matter + "About us", encoding="utf8")
+        a_propos = Path(repo_path) / "content" / "fr" / "a-propos.md"
+        a_propos.write_text(front_matter + "A propos", encoding="utf8")
+        repo.git.add(A=True)
+        repo.git.commit(m="linked contents")
+
+        # Commits are dated before the cache, so the rerun has no new commits
+        time.sleep(1)
+
+        kwargs = dict(
+            content_paths=["content"],
+            extensions=[".md"],
+            repo_path=repo_path,
+            branch="test",
+            use_cache=True,
+            translation_key=True,
+        )
+        reader = FileReader(**kwargs)
+        got = reader.parse_history()
+
+        # Files linked by translationKey are found without new commits
+        rerun = FileReader(**kwargs)
+        assert rerun.parse_history() == got
+        assert rerun.status_of(Path("content") / "fr" / "a-propos.md") == "completed"
+        shutil.rmtree(reader.cache.cache_dir)
+
+        # The front matter of each blob is cached
+        assert os.path.isfile(reader.frontmatter_cache.path)
+        assert len(reader.frontmatter_cache) == 4
+        shutil.rmtree(os.path.dirname(reader.frontmatter_cache.path))
+
+        assert set(got) == {"test_content.md", "about"}
+        assert got["about"]["en"]["filename"] == Path("content") / "en" / "about.md"
+        assert got["about"]["fr"]["filename"] == Path("content") / "fr" / "a-propos.md"
+        assert reader.status_of(Path("content") / "fr" / "a-propos.md") == "completed"
+
     @pytest.mark.parametrize(
         "pattern, fname, basename, lang",
         [
@@ -200,6 +255,99 @@ class TestFileReader:
         assert got_basename == basename
         assert got_lang == lang
 
+    @pytest.mark.parametrize(
+        "pattern, langs, fname, basename, lang",
+        [
+            ("folder/", "", os.path.join("content", "pt-BR", "a.md"), "a.md", "pt-BR"),
+            (
+                "folder/",
+                "",
+                os.path.join("content", "zh-Hans", "a.md"),
+                "a.md",
+                "zh-Hans",
+            ),
+            (".lang", "", os.path.join("content", "a.es-419.md"), "a.md", "es-419"),
+            (
+                ".lang",
+                "",
+                os.path.join("content", "en.d", "a.fr.md"),
+                "en.d/a.md",
+                "fr",
+            ),
+            (
+                ".lang",
+                "pt pt-BR",
+                os.path.join("content", "a.pt-BR.md"),
+                "a.md",
+                "pt-BR",
+            ),
+            ("folder/", "EN FR", os.path.join("content", "FR", "a.md"), "a.md", "FR"),
+        ],
+    )
+    def test_parse_base_lang_tags(self, pattern, langs, fname, basename, lang):
+        """
+        Assert BCP-47 tags and specified languages are parsed.
+        """
+        reader = FileReader(langs=langs, pattern=pattern)
+
+        assert reader.parse_base_lang(fname) == (basename, lang)
+        assert reader.parse_base_lang(Path(fname)) == (basename, lang)
+
+    @pytest.mark.parametrize(
+        "pattern, content_paths, fname, basename",
+        [
+            ("folder/", ["content"], "content/en/posts/a/index.md", "posts/a/index.md"),
+            ("folder/", ["content"], "content/en/posts/b/index.md", "posts/b/index.md"),
+            ("folder/", ["content/en"], "content/en/posts/index.md", "posts/index.md"),
+            ("folder/", ["data"], "content/en/index.md", "content/index.md"),
+            (".lang", ["content"], "content/posts/a/index.en.md", "posts/a/index.md"),
+            (".lang", ["./content/"], "content/posts/index.en.md", "posts/index.md"),
+        ],
+    )
+    def test_parse_base_lang_identity(self, pattern, content_paths, fname, basename):
+        """
+        Assert the basename is the path relative to the content path without
+        the language, so that page bundles do not collide.
+        """
+        reader = FileReader(content_paths=content_paths, pattern=pattern)
+
+        assert reader.parse_base_lang(fname) == (basename, "en")
+
+    def test_parse_base_lang_mixed(self):
+        """
+        Assert each content path is parsed with its own pattern.
+        """
+        reader = FileReader(
+            content_paths=["content", "i18n"],
+            extensions=[".md", ".toml"],
+            pattern={"content": "folder/", "i18n": ".lang"},
+        )
+
+        fname = os.path.join("content", "fr", "blog", "post.md")
+        assert reader.parse_base_lang(fname) == ("blog/post.md", "fr")
+        fname = os.path.join("i18n", "menu.fr.toml")
+        assert reader.parse_base_lang(fname) == ("menu.toml", "fr")
+        # Files outside of the content paths use "folder/"
+        fname = os.path.join("data", "fr", "menu.toml")
+        assert reader.parse_base_lang(fname) == ("data/menu.toml", "fr")
+
+    @pytest.mark.parametrize(
+        "pattern, fname",
+        [
+            ("folder/", os.path.join("content", "english", "file.md")),
+            ("folder/", os.path.join("content", "file.en.md")),
+            (".lang", os.path.join("content", "file.end.md")),
+            ("lang/", os.path.join("content", "en", "file.md")),
+        ],
+    )
+    def test_parse_base_lang_fail(self, pattern, fname):
+        """
+        Assert file names without language raise exception.
+        """
+        reader = FileReader(pattern=pattern)
+        with pytest.raises(Exception, match=r"Unable to parse file"):
+            reader.parse_base_lang(fname)
+
     def test_get_langs(self):
         """
         Assert self.langs can be specified.
@@ -211,6 +359,27 @@ class TestFileReader:
         want = {"EN", "FR"}
         assert got == want
 
+    def test_get_langs_repeated(self):
+        """
+        Assert repeated calls leave self.langs unchanged and only register new
+        locales, which set_langs fills in every basename.
+        """
+        reader = FileReader(langs="en fr")
+        commits = {"a.md": {"en": {}, "fr": {}}, "b.md": {"en": {}}}
+
+        for _ in range(3):
+            assert reader.get_langs(commits) == {"en", "fr"}
+        assert reader.langs == ["en", "fr"]
+        assert list(reader.locales) == ["en", "fr"]
+
+        commits["c.md"] = {"ja": {}}
+        assert reader.set_langs(commits, {"c.md"}) == {"a.md", "b.md", "c.md"}
+        assert list(reader.locales) == ["en", "fr", "ja"]
+        assert set(commits["a.md"]) == {"en", "fr", "ja"}
+        assert set(commits["c.md"]) == {"en", "fr", "ja"}
+        # Only the basenames given are checked for the known locales
+        assert set(commits["b.md"]) == {"en", "ja"}
+
     def test_get_sources(self):
         """
         Assert when first commit time is the same for the source and target files,
@@ -233,3 +402,97 @@ class TestFileReader:
         reader.set_status(commits, self.sources)
 
         assert commits == self.commits_status
+
+    def test_export_history(self):
+        """
+        Assert the commit history is exported with one row per commit of a file.
+        """
+        pytest.importorskip("numpy")
+
+        reader = FileReader()
+        records, tables = reader.export_history(self.commits_status)
+
+        assert tables["basename"] == ["file.md"]
+        assert tables["locale"] == ["fr", "en", "zh"]
+        assert records.dtype.names == (
+            "basename",
+            "locale",
+            "status",
+            "timestamp",
+            "additions",
+            "deletions",
+            "lines",
+        )
+        assert len(records) == 5
+
+        locales = [tables["locale"][code] for code in records["locale"]]
+        statuses = [tables["status"][code] for code in records["status"]]
+        assert locales == ["fr", "fr", "en", "en", "zh"]
+        assert statuses == ["source", "source", "completed", "completed", "updated"]
+        assert records["timestamp"].tolist() == [0.1, 0.3, 0.1, 0.3, 0.2]
+        assert records["lines"].tolist() == [2, 4, 2, 4, 2]
+
+    def test_parse_history_incremental(self, tmpdir, monkeypatch):
+        """
+        Assert an incremental parse only recomputes the basenames touched by new
+        commits and keeps the stats in sync with the statuses.
+        """
+        # Write the caches into the temporary directory
+        monkeypatch.chdir(tmpdir)
+        repo_path, _, _ = self.generate_fixtures(tmpdir, "test_dirty_repo", "folder/")
+        repo = git.Repo(repo_path)
+        content = Path(repo_path) / "content"
+
+        (content / "en" / "b.md").write_text("source", encoding="utf8")
+        repo.git.add(A=True)
+        repo.git.commit(m="second source file")
+
+        # Translation in a new locale is a target before it is committed
+        (content / "ja").mkdir()
+        (content / "ja" / "test_content.md").write_text("ja", encoding="utf8")
+
+        reader = FileReader(
+            repo_path=repo_path, branch="test", use_cache=True, src_lang="en"
+        )
+        get_sources = reader.get_sources
+        dirty = []
+
+        def spy(commits, basenames=None):
+            dirty.append(set(basenames))
+            return get_sources(commits, basenames)
+
+        reader.get_sources = spy
+        reporter = FileReporter()
+
+        try:
+            reader.parse_history()
+            assert dirty[-1] == {"test_content.md", "b.md"}
+
+            # New commits are made after the cache of the first parse
+            time.sleep(1)
+            repo.git.add(A=True)
+            repo.git.commit(m="new locale")
+
+            # The cache of the next parse is dated after the new commit
+            time.sleep(1)
+            got = reader.parse_history()
+            assert dirty[-1] == {"test_content.md", "b.md"}
+            assert got["b.md"]["ja"] == {"status": "open"}
+            assert reader.stats == reporter.get_stats(got)
+
+            time.sleep(1)
+            (content / "en" / "b.md").write_text("source\nupdate", encoding="utf8")
+            repo.git.add(A=True)
+            repo.git.commit(m="update source")
+
+            got = reader.parse_history()
+            assert dirty[-1] == {"b.md"}
+            assert reader.stats == reporter.get_stats(got)
+            assert reader.stats["ja"] == {
+                "open": 1,
+                "updated": 0,
+                "completed": 1,
+                "total": 2,
+            }
+        finally:
+            shutil.rmtree(reader.cache.cache_dir)
@@ -14,10 +14,11 @@ Test the reporter for file-based translation monitoring
 
 
 import os
+import csv
 import json
 import pytest
 
-from rumi.file_rumi.reporter import FileReporter
+from rumi.file_rumi.reporter import Detail, FileReporter
 
 
 ##########################################################################
@@ -89,35 +90,72 @@ class TestFileReporter:
         got = reporter.get_details(self.commits_status)
 
         want = [
-            {
-                "basefile": "file.md",
-                "status": "completed",
-                "src_lang": "fr",
-                "wc": "4",
-                "tgt_lang": "en",
-                "pc": "100.0%",
-                "pu": "0%",
-            },
-            {
-                "basefile": "file.md",
-                "status": "updated",
-                "src_lang": "fr",
-                "wc": "4",
-                "tgt_lang": "zh",
-                "pc": "50.0%",
-                "pu": "50.0%",
-            },
-            {
-                "basefile": "file.md",
-                "status": "open",
-                "src_lang": "fr",
-                "wc": "4",
-                "tgt_lang": "ja",
-                "pc": "0%",
-                "pu": "100.0%",
-            },
+            Detail("file.md", "completed", "fr", 4, "en", 1.0, 0.0),
+            Detail("file.md", "updated", "fr", 4, "zh", 0.5, 0.5),
+            Detail("file.md", "open", "fr", 4, "ja", 0.0, 1.0),
         ]
         assert got == want
+        # Percentages are floats in every status
+        assert all(type(row.pc) is type(row.pu) is float for row in got)
+
+    @pytest.mark.parametrize(
+        "src_lang, tgt_lang, want",
+        [
+            ("", "zh", ["zh"]),
+            ("fr", "", ["en", "zh", "ja"]),
+            ("fr", "ja", ["ja"]),
+            ("", "fr", []),
+            ("en", "", []),
+        ],
+    )
+    def test_get_details_filters(self, tmpdir, src_lang, tgt_lang, want):
+        """
+        Assert only the requested pairs are computed and returned.
+        """
+        repo_path = self.generate_fixture(tmpdir)
+        reporter = FileReporter(
+            repo_path=repo_path, src_lang=src_lang, tgt_lang=tgt_lang
+        )
+
+        counted = []
+        word_count = reporter.word_count
+        reporter.word_count = lambda file: counted.append(file) or word_count(file)
+
+        got = reporter.get_details(self.commits_status)
+        assert [row.tgt_lang for row in got] == want
+        # Words are only counted for basefiles with requested pairs
+        assert len(counted) == (1 if want else 0)
+
+    def test_get_details_workers(self, tmpdir):
+        """
+        Assert word counts in a thread pool keep the order and results of the
+        details.
+        """
+        repo_path = tmpdir / "repo"
+        commits = {}
+        for idx in range(20):
+            basefile = "file{}.md".format(idx)
+            src_file = repo_path / "content" / "en" / basefile
+            src_file.ensure()
+            src_file.write_text("word " * idx, encoding="utf-8")
+
+            commits[basefile] = {
+                "en": {
+                    "filename": os.path.join("content", "en", basefile),
+                    "ft": 1.0,
+                    "lt": 1.0,
+                    "history": {1.0: [1, 0, 1]},
+                    "status": "source",
+                },
+                "fr": {"status": "open"},
+            }
+
+        reporter = FileReporter(repo_path=repo_path)
+        got = reporter.get_details(commits, workers=4)
+
+        assert got == reporter.get_details(commits, workers=1)
+        assert [row.basefile for row in got] == list(commits)
+        assert [row.wc for row in got] == list(range(20))
 
     def test_print_score(self, tmpdir, capsys):
         """
@@ -136,6 +174,15 @@ class TestFileReporter:
 
         assert captured.out == want
 
+        # No target file left by the language filters
+        reporter = FileReporter(repo_path=repo_path, tgt_lang="de")
+        details = reporter.get_details(self.commits_status)
+        assert details == []
+        assert reporter.print_score(details) == 0.0
+
+        captured = capsys.readouterr()
+        assert captured.out == "Translation coverage 0.0%\n"
+
     def test_print_details(self, tmpdir, capsys):
         """
         Assert reporter.detail() prints with no error.
@@ -151,9 +198,68 @@ class TestFileReporter:
         with open(tmpdir / "translation_details.json", "r") as f:
             got = json.load(f)
 
-        assert got == details
+        assert got == [row._asdict() for row in details]
         assert captured.out == self.details_table
 
+    @pytest.mark.parametrize(
+        "sort_by, top, want",
+        [("wc", 2, ["file2.md", "file1.md"]), ("pu", 1, ["file0.md"])],
+    )
+    def test_print_details_top(self, capsys, sort_by, top, want):
+        """
+        Assert only the top rows by word count or percent updated are printed.
+        """
+        details = [
+            Detail("file0.md", "open", "en", 1, "fr", 0, 1.0),
+            Detail("file1.md", "updated", "en", 20, "fr", 0.5, 0.5),
+            Detail("file2.md", "completed", "en", 300, "fr", 1.0, 0),
+        ]
+        reporter = FileReporter()
+        reporter.print_details(details, top=top, sort_by=sort_by)
+
+        lines = capsys.readouterr().out.splitlines()[2:]
+        assert [line.split()[1] for line in lines] == want
+
+        with pytest.raises(Exception, match="Please specify sort_by"):
+            reporter.print_details(details, top=top, sort_by="status")
+
+    @pytest.mark.parametrize("format", ["jsonl", "csv"])
+    def test_dump_details(self, tmpdir, format):
+        """
+        Assert the details are streamed from iter_details into the report.
+        """
+        repo_path = self.generate_fixture(tmpdir)
+        reporter = FileReporter(repo_path=repo_path)
+
+        details = reporter.iter_details(self.commits_status)
+        filename = reporter.dump_details(details, dump_path=tmpdir, format=format)
+        assert filename == tmpdir / "translation_details.{}".format(format)
+
+        with open(filename, "r", newline="", encoding="utf-8") as f:
+            if format == "jsonl":
+                got = [Detail(**json.loads(line)) for line in f]
+            else:
+                rows = list(csv.reader(f))
+                assert rows[0] == list(Detail._fields)
+                got = [
+                    Detail(b, s, sl, int(wc), tl, float(pc), float(pu))
+                    for b, s, sl, wc, tl, pc, pu in rows[1:]
+                ]
+
+        assert got == reporter.get_details(self.commits_status)
+
+    def test_dump_stats(self, tmpdir):
+        """
+        Assert the stats are written with one row per locale.
+        """
+        reporter = FileReporter()
+        stats = reporter.get_stats(self.commits_status)
+        filename = reporter.dump_stats(stats, dump_path=tmpdir)
+
+        with open(filename, "r", encoding="utf-8") as f:
+            got = [json.loads(line) for line in f]
+        assert {row.pop("locale"): row for row in got} == stats
+
     def test_word_count(self, tmpdir):
         """
         Assert empty lines are ignored in word count.
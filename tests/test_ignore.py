@@ -0,0 +1,71 @@
+# tests.test_ignore
+# Test the gitignore-style rules for discovering targets
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Test the gitignore-style rules for discovering targets
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import pytest
+
+from rumi.ignore import IgnoreMatcher
+
+
+##########################################################################
+# IgnoreMatcher Test Cases
+##########################################################################
+
+
+class TestIgnoreMatcher:
+    @pytest.mark.parametrize(
+        "rules, path, is_dir, ignored",
+        [
+            # Patterns without separator match at any level
+            (["node_modules/"], "node_modules", True, True),
+            (["node_modules/"], "web/node_modules", True, True),
+            (["node_modules/"], "web/node_modules", False, False),
+            (["*.min.md"], "content/en/page.min.md", False, True),
+            (["*.min.md"], "content/en/page.md", False, False),
+            # Patterns with separator are relative to the root
+            (["/build"], "build", True, True),
+            (["/build"], "content/build", True, False),
+            (["content/*/drafts"], "content/en/drafts", True, True),
+            (["content/*/drafts"], "content/en/blog/drafts", True, False),
+            (["content/**/drafts"], "content/en/blog/drafts", True, True),
+            (["vendor/**"], "vendor/a/b.md", False, True),
+            (["page?.md"], "page1.md", False, True),
+            (["page[!0-9].md"], "page1.md", False, False),
+            # The last matching rule wins
+            (["*.md", "!keep.md"], "content/keep.md", False, False),
+            (["!keep.md", "*.md"], "content/keep.md", False, True),
+            # Comments, blank lines and escapes
+            (["# comment", "", "\\#hash.md"], "#hash.md", False, True),
+            ([], "content/en/page.md", False, False),
+        ],
+    )
+    def test_match(self, rules, path, is_dir, ignored):
+        """
+        Assert gitignore-style rules are matched like gitignore.
+        """
+        matcher = IgnoreMatcher(rules)
+        assert matcher.match(path, is_dir=is_dir) == ignored
+
+    def test_from_file(self, tmpdir):
+        """
+        Assert rules are loaded from a file, and missing files load no rules.
+        """
+        ignore_file = tmpdir / ".rumiignore"
+        ignore_file.write_text("# generated\nnode_modules/\n", encoding="utf8")
+
+        matcher = IgnoreMatcher.from_file(str(ignore_file))
+        assert matcher
+        assert matcher.match("node_modules", is_dir=True)
+
+        assert not IgnoreMatcher.from_file(str(tmpdir / "missing"))
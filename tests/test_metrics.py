@@ -0,0 +1,151 @@
+# tests.test_metrics
+# Test the persistent blob-keyed metrics of the target files
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Test the persistent blob-keyed metrics of the target files
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import git
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+from rumi.cache import BlobCache
+from rumi.metrics import MetricsStore, count_lines, count_metrics, count_words
+from rumi.file_rumi.reporter import FileReporter
+
+
+##########################################################################
+# MetricsStore Test Cases
+##########################################################################
+
+
+class TestMetricsStore:
+    @pytest.mark.parametrize(
+        "content",
+        [
+            "",
+            "one line",
+            "Hello world\n\nThis is a test.\n",
+            "Windows\r\nline endings\r\n",
+        ],
+    )
+    def test_count_metrics(self, tmpdir, content):
+        """
+        Assert the metrics match the counts read from the file.
+        """
+        target = tmpdir / "page.md"
+        target.write_binary(content.encode("utf8"))
+
+        metrics = count_metrics(content.encode("utf8"))
+        with open(target, "r") as f:
+            assert metrics["lines"] == len(f.readlines())
+        assert metrics["words"] == FileReporter(tmpdir).word_count("page.md")
+        assert metrics["bytes"] == len(content.encode("utf8"))
+
+    @pytest.mark.parametrize(
+        "content, words",
+        [
+            # Runs of whitespace do not make empty words
+            (b"one  two\tthree\n\n  four ", 4),
+            # Front matter is not counted
+            (b"---\ntitle: Hello world\n---\nBody text\n", 2),
+            (b"+++\ntitle = 'Hello world'\n+++\nBody text\n", 2),
+            (b'{\n"title": "Hello world"\n}\nBody text\n', 2),
+            # Unterminated front matter is prose
+            (b"---\ntitle: Hello\n", 3),
+            # Fenced code blocks are not counted
+            (b"Intro\n```python\nprint('hi')\n```\nOutro\n", 2),
+            (b"Intro\n~~~~\n```\ncode\n~~~~\nOutro\n", 2),
+            (b"Intro\n```\nunterminated code\n", 1),
+            # Han, Hiragana and Katakana characters are counted one by one
+            ("\u7ffb\u8a33\u306e\u30c6\u30b9\u30c8 test".encode("utf8"), 7),
+            ("\ubc88\uc5ed \ud14c\uc2a4\ud2b8".encode("utf8"), 2),
+        ],
+    )
+    def test_count_words(self, content, words):
+        """
+        Assert words are counted in prose only.
+        """
+        assert count_words(content) == words
+
+    def test_count_words_raw(self):
+        """
+        Assert front matter and code are counted when markdown is disabled.
+        """
+        content = b"---\ntitle: x\n---\n```\ncode\n```\n"
+        assert count_words(content, markdown=False) == 7
+
+    @pytest.mark.parametrize(
+        "content, lines", [(b"", 0), (b"a", 1), (b"a\n", 1), (b"a\n\nb", 3)]
+    )
+    def test_count_lines(self, content, lines):
+        """
+        Assert the last line is counted without line break.
+        """
+        assert count_lines(content) == lines
+
+    def test_get(self, tmpdir):
+        """
+        Assert metrics are computed from blobs and cached by blob SHA.
+        """
+        repo = git.Repo.init(tmpdir / "repo")
+        blob_file = tmpdir / "page.md"
+        blob_file.write_text("Hello world\nBonjour\n", encoding="utf8")
+        sha = repo.git.hash_object("-w", str(blob_file))
+
+        cache = BlobCache("repo", "file", "metrics", persist=False)
+        store = MetricsStore(cache)
+        store.set_blobs(repo, {"content/en/page.md": sha})
+
+        assert store.get("content/fr/page.md") is None
+        assert store.get("content/en/page.md") == {"lines": 2, "words": 3, "bytes": 20}
+        assert sha in cache
+
+        # Cached metrics are not computed again
+        cache[sha] = {"lines": 0, "words": 42, "bytes": 0}
+        assert store.get("content/en/page.md")["words"] == 42
+
+    def test_get_threads(self, tmpdir):
+        """
+        Assert the blobs of cache misses can be read from several threads.
+        """
+        repo = git.Repo.init(tmpdir / "repo")
+        blobs = {}
+        for idx in range(100):
+            blob_file = tmpdir / "page{}.md".format(idx)
+            blob_file.write_text(" ".join(["word"] * idx), encoding="utf8")
+            blobs["content/en/page{}.md".format(idx)] = repo.git.hash_object(
+                "-w", str(blob_file)
+            )
+
+        store = MetricsStore()
+        store.set_blobs(repo, blobs)
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            got = list(executor.map(lambda path: store.get(path)["words"], blobs))
+
+        assert got == list(range(100))
+
+    def test_reporter_metrics(self, tmpdir):
+        """
+        Assert the reporter takes word counts from the metrics without opening
+        the file.
+        """
+        repo = git.Repo.init(tmpdir / "repo")
+        blob_file = tmpdir / "page.md"
+        blob_file.write_text("one two three", encoding="utf8")
+        sha = repo.git.hash_object("-w", str(blob_file))
+
+        store = MetricsStore()
+        store.set_blobs(repo, {"content/en/page.md": sha})
+
+        # The file does not exist in the repository path
+        reporter = FileReporter(repo_path=tmpdir / "missing", metrics=store)
+        assert reporter.word_count("content/en/page.md") == 3
@@ -29,7 +29,7 @@ def commits(request):
     """
 
     commits = {
-        # For testing "updated" status
+        # For testing the status of a message deleted from the source
         "updated_message": {
             # source
             "en": {
@@ -38,15 +38,14 @@ def commits(request):
                 "lt": 2.0,
                 "history": [(1.0, "message"), (2.0, "deleted")],
             },
-            # hasn't been translated but in "updated" status because the
-            # original message were deleted
+            # hasn't been translated, missing since the source was deleted
             "fr": {
                 "filename": os.path.join("src", "locales", "fr", "messages.po"),
                 "ft": 1.0,
                 "lt": 1.0,
                 "history": [(1.0, "")],
             },
-            # has been translated but in "updated" status
+            # has been translated, missing since the source was deleted
             "ja": {
                 "filename": os.path.join("src", "locales", "ja", "messages.po"),
                 "ft": 1.0,
@@ -165,8 +164,8 @@ def stats_table(request):
         "| Language   |   Total |   Open |   Updated |   Completed |",
         "|------------+---------+--------+-----------+-------------|",
         "| en         |       2 |      0 |         0 |           0 |",
-        "| fr         |       2 |      1 |         1 |           0 |",
-        "| ja         |       2 |      0 |         1 |           1 |",
+        "| fr         |       1 |      1 |         0 |           0 |",
+        "| ja         |       1 |      0 |         0 |           1 |",
     ]
 
     table = "\n".join(rows) + "\n"
@@ -0,0 +1,266 @@
+# tests.test_msg_rumi.test_catalog
+# Test the reader for key-level monitoring of structured catalogs
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Test the reader for key-level monitoring of structured catalogs
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import git
+import shutil
+import pytest
+
+from pathlib import Path
+from datetime import datetime
+from rumi.msg_rumi.catalog import CatalogReader, flatten, parse_catalog
+from rumi.msg_rumi.reporter import MsgReporter
+
+
+##########################################################################
+# CatalogReader Test Cases
+##########################################################################
+
+
+class TestCatalogReader:
+    def generate_fixtures(self, tmpdir):
+        """
+        Generate fixture repo with hugo i18n catalogs for testing CatalogReader.
+        """
+        repo_name = "catalog_reader_repo"
+        repo_path = tmpdir / repo_name
+        repo = git.Repo.init(repo_path)
+
+        # Git config needed for making commits
+        repo.config_writer().set_value("user", "name", "testrumi").release()
+        repo.config_writer().set_value("user", "email", "testrumiemail").release()
+
+        # Initial commit
+        initial_file = repo_path / "initial_file.txt"
+        initial_file.write_text("", encoding="utf8")
+        repo.git.add(A=True)
+        repo.git.commit(m="initial commit")
+
+        repo.git.branch("test")
+        repo.git.checkout("test")
+
+        i18n_dir = repo_path / "i18n"
+        i18n_dir.mkdir()
+        en_file = i18n_dir / "en.toml"
+        fr_file = i18n_dir / "fr.toml"
+
+        # Author dates are set so that each commit has a distinct timestamp
+        # Source catalog is added with two keys
+        en_file.write_text(
+            '[home]\nother = "Home"\n\n[about]\nother = "About"\n', encoding="utf8"
+        )
+        repo.git.add(A=True)
+        repo.git.commit(m="add source catalog", date="2021-11-01 12:00:00")
+        ts1 = float(datetime.timestamp(repo.head.commit.authored_datetime))
+
+        # One key is translated
+        fr_file.write_text('[home]\nother = "Accueil"\n', encoding="utf8")
+        repo.git.add(A=True)
+        repo.git.commit(m="add french catalog", date="2021-11-02 12:00:00")
+        ts2 = float(datetime.timestamp(repo.head.commit.authored_datetime))
+
+        # One key is deleted from the source
+        en_file.write_text('[home]\nother = "Home"\n', encoding="utf8")
+        repo.git.add(A=True)
+        repo.git.commit(m="delete about key", date="2021-11-03 12:00:00")
+        ts3 = float(datetime.timestamp(repo.head.commit.authored_datetime))
+
+        return str(repo_path), [ts1, ts2, ts3]
+
+    def test_parse_history(self, tmpdir, monkeypatch):
+        """
+        Assert git history of the catalogs is parsed into a commit dictionary.
+        """
+        # Write the caches into the temporary directory
+        monkeypatch.chdir(tmpdir)
+        repo_path, ts = self.generate_fixtures(tmpdir)
+
+        reader = CatalogReader(
+            repo_path=repo_path,
+            branch="test",
+            content_paths=["i18n"],
+            extensions=[".toml"],
+            src_lang="en",
+            use_cache=True,
+        )
+
+        got = reader.parse_history()
+        # Need to remove cached history and catalogs after test
+        shutil.rmtree(reader.cache.cache_dir)
+        shutil.rmtree(Path(reader.catalogs.path).parent)
+
+        en_file = Path("i18n") / "en.toml"
+        fr_file = Path("i18n") / "fr.toml"
+        want = {
+            "home.other": {
+                "en": {
+                    "filename": en_file,
+                    "ft": ts[0],
+                    "lt": ts[0],
+                    "history": [(ts[0], "Home")],
+                },
+                "fr": {
+                    "filename": fr_file,
+                    "ft": ts[1],
+                    "lt": ts[1],
+                    "history": [(ts[1], "Accueil")],
+                },
+            },
+            "about.other": {
+                "en": {
+                    "filename": en_file,
+                    "ft": ts[0],
+                    "lt": ts[2],
+                    "history": [(ts[0], "About"), (ts[2], '"deleted"')],
+                },
+            },
+        }
+        assert got == want
+
+        status = MsgReporter().get_status(got, "en")
+        assert status["locales"] == ["en", "fr"]
+        assert status["msgs"]["home.other"][1] == "sc"
+        assert status["msgs"]["about.other"][1] == "d-"
+
+    def test_remove_target_key(self, tmpdir, monkeypatch):
+        """
+        Assert a key removed from a target catalog is open again.
+        """
+        # Write the caches into the temporary directory
+        monkeypatch.chdir(tmpdir)
+        repo_path, ts = self.generate_fixtures(tmpdir)
+
+        repo = git.Repo(repo_path)
+        fr_file = Path(repo_path) / "i18n" / "fr.toml"
+        fr_file.write_text("", encoding="utf8")
+        repo.git.add(A=True)
+        repo.git.commit(m="remove french key", date="2021-11-04 12:00:00")
+
+        reader = CatalogReader(
+            repo_path=repo_path,
+            branch="test",
+            content_paths=["i18n"],
+            extensions=[".toml"],
+            src_lang="en",
+            use_cache=False,
+        )
+        got = reader.parse_history()
+
+        assert got["home.other"]["fr"] == {
+            "filename": None,
+            "ft": ts[0],
+            "lt": ts[0],
+            "history": [(ts[0], "")],
+        }
+
+        status = MsgReporter().get_status(got, "en")
+        assert status["msgs"]["home.other"][1] == "so"
+
+    def test_parse_root_commit(self, tmpdir):
+        """
+        Assert catalogs added in the first commit of the repository are parsed,
+        and keys only found in a target catalog are skipped by the reporter.
+        """
+        repo_path = tmpdir / "catalog_root_repo"
+        repo = git.Repo.init(repo_path)
+        repo.config_writer().set_value("user", "name", "testrumi").release()
+        repo.config_writer().set_value("user", "email", "testrumiemail").release()
+
+        i18n_dir = repo_path / "i18n"
+        i18n_dir.mkdir()
+        (i18n_dir / "en.json").write_text('{"home": "Home"}', encoding="utf8")
+        (i18n_dir / "fr.json").write_text(
+            '{"home": "Accueil", "extra": "En plus"}', encoding="utf8"
+        )
+        repo.git.add(A=True)
+        repo.git.commit(m="add catalogs", date="2021-11-01 12:00:00")
+        ts = float(datetime.timestamp(repo.head.commit.authored_datetime))
+
+        reader = CatalogReader(
+            repo_path=str(repo_path),
+            branch=repo.active_branch.name,
+            extensions=[".json"],
+            use_cache=False,
+        )
+        got = reader.parse_history()
+
+        assert got["home"]["fr"]["history"] == [(ts, "Accueil")]
+        assert set(got["extra"]) == {"fr"}
+
+        reporter = MsgReporter()
+        status = reporter.get_status(got, "en")
+        assert status == {"locales": ["en", "fr"], "msgs": {"home": (1, "sc")}}
+        assert reporter.get_stats(got, "en")["fr"]["completed"] == 1
+
+    def test_parse_catalogs_once(self, tmpdir):
+        """
+        Assert each catalog blob is parsed only once.
+        """
+        repo_path, _ = self.generate_fixtures(tmpdir)
+
+        reader = CatalogReader(
+            repo_path=repo_path,
+            branch="test",
+            extensions=[".toml"],
+            use_cache=False,
+        )
+        reader.parse_history()
+
+        # Two versions of en.toml and one of fr.toml
+        assert len(reader.catalogs) == 3
+
+    def test_parse_lang(self):
+        """
+        Assert locale is parsed from the catalog filename with either pattern.
+        """
+        reader = CatalogReader(pattern=".lang")
+        assert reader.parse_lang(Path("i18n") / "fr.toml") == "fr"
+        assert reader.parse_lang(Path("i18n") / "messages.pt-BR.json") == "pt-BR"
+
+        reader = CatalogReader(pattern="folder/")
+        assert reader.parse_lang(Path("locales") / "ja" / "messages.json") == "ja"
+
+    def test_flatten(self):
+        """
+        Assert nested tables and legacy id/translation lists are flattened.
+        """
+        assert flatten({"a": {"b": "x", "c": 1}, "d": None}) == {
+            "a.b": "x",
+            "a.c": "1",
+            "d": "",
+        }
+        assert flatten([{"id": "home", "translation": "Home"}]) == {"home": "Home"}
+
+    @pytest.mark.parametrize(
+        "data, suffix",
+        [
+            (b'{"home": {"other": "Home"}}', ".json"),
+            (b'[home]\nother = "Home"\n', ".toml"),
+            (b"home:\n  other: Home\n", ".yaml"),
+        ],
+    )
+    def test_parse_catalog(self, data, suffix):
+        """
+        Assert JSON, TOML and YAML catalogs are parsed into the same key map.
+        """
+        if suffix == ".yaml":
+            pytest.importorskip("yaml")
+        assert parse_catalog(data, suffix) == {"home.other": "Home"}
+
+    def test_parse_catalog_fail(self):
+        """
+        Assert unknown catalog formats raise an exception.
+        """
+        with pytest.raises(Exception, match="Unable to parse .po catalogs"):
+            parse_catalog(b'msgid "a"', ".po")
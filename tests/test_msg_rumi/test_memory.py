@@ -0,0 +1,143 @@
+# tests.test_msg_rumi.test_memory
+# Test the translation memory for message-based translation monitoring
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Test the translation memory for message-based translation monitoring
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import random
+import pytest
+
+from rumi.msg_rumi.memory import (
+    ShingleIndex,
+    TranslationMemory,
+    normalize,
+    shingles,
+    similarity,
+)
+
+
+##########################################################################
+# TranslationMemory Test Cases
+##########################################################################
+
+
+class TestShingleIndex:
+    def test_normalize(self):
+        """
+        Assert quotes, case and white spaces are normalized.
+        """
+        assert normalize('"Hello   World "') == "hello world"
+
+    def test_query(self):
+        """
+        Assert similar messages are found and sorted by similarity.
+        """
+        index = ShingleIndex()
+        index.add("a", '"Save your changes"')
+        index.add("b", '"Save all your changes"')
+        index.add("c", '"Delete the account"')
+
+        got = [key for _, key in index.query('"Save your changes"', threshold=0.6)]
+        assert got == ["a", "b"]
+
+        index.remove("a")
+        assert "a" not in index
+        got = [key for _, key in index.query('"Save your changes"', threshold=0.6)]
+        assert got == ["b"]
+
+    @pytest.mark.parametrize("threshold", [0.3, 0.5, 0.8])
+    def test_query_brute_force(self, threshold):
+        """
+        Assert the prefix filtered lookup finds the same matches as comparing
+        against every indexed message.
+        """
+        rng = random.Random(42)
+        words = ["save", "delete", "account", "your", "the", "changes", "open"]
+
+        index = ShingleIndex()
+        msgs = {}
+        for i in range(200):
+            msg = " ".join(rng.choice(words) for _ in range(rng.randint(1, 5)))
+            msgs[i] = msg
+            index.add(i, msg)
+
+        query = "save the changes"
+        grams = shingles(query)
+        want = sorted(
+            key
+            for key, msg in msgs.items()
+            if similarity(grams, shingles(msg)) >= threshold
+        )
+        got = sorted(key for _, key in index.query(query, threshold=threshold))
+        assert got == want
+
+
+@pytest.mark.usefixtures("commits", "src_lang")
+class TestTranslationMemory:
+    def test_suggest(self):
+        """
+        Assert the latest non-empty translation is suggested for similar msgids.
+        """
+        memory = TranslationMemory(self.commits, self.src_lang)
+
+        assert memory.suggest('"Message"', "ja", threshold=0.5) == [
+            {"score": 1.0, "exact": False, "msgid": "message", "msgstr": "メッセージ"},
+            {
+                "score": 0.556,
+                "exact": False,
+                "msgid": "updated_message",
+                "msgstr": "メッセージ",
+            },
+        ]
+        assert memory.suggest('"message"', "ja") == [
+            {"score": 1.0, "exact": True, "msgid": "message", "msgstr": "メッセージ"}
+        ]
+
+        # Source language and never translated locales are not in the memory
+        assert memory.suggest("message", "fr") == []
+        assert memory.suggest("message", "en") == []
+
+    def test_suggest_repeated_tokens(self):
+        """
+        Assert messages with the same shingles but repeated tokens score 1.0
+        without being exact matches.
+        """
+        commits = {
+            '"ha ha"': {
+                "en": {"ft": 1.0, "lt": 1.0, "history": [(1.0, '"ha ha"')]},
+                "fr": {"ft": 1.0, "lt": 2.0, "history": [(2.0, '"ah ah"')]},
+            },
+        }
+        memory = TranslationMemory(commits, "en")
+
+        assert memory.suggest('"ha ha ha ha"', "fr") == [
+            {"score": 1.0, "exact": False, "msgid": '"ha ha"', "msgstr": '"ah ah"'}
+        ]
+        assert memory.suggest('"ha ha"', "fr")[0]["exact"]
+        assert not memory.suggest('"HA  ha"', "fr")[0]["exact"]
+
+    def test_suggest_case(self):
+        """
+        Assert messages only differing in case are not exact matches.
+        """
+        commits = {
+            '"US"': {
+                "en": {"ft": 1.0, "lt": 1.0, "history": [(1.0, '"US"')]},
+                "fr": {"ft": 1.0, "lt": 2.0, "history": [(2.0, '"États-Unis"')]},
+            },
+        }
+        memory = TranslationMemory(commits, "en")
+
+        assert memory.suggest('"us"', "fr") == [
+            {"score": 1.0, "exact": False, "msgid": '"US"', "msgstr": '"États-Unis"'}
+        ]
+        assert memory.suggest('"US"', "fr")[0]["exact"]
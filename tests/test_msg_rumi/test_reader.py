@@ -16,6 +16,7 @@ Test the reader for message-based translation monitoring
 import os
 import git
 import time
+import pytest
 import shutil
 
 from pathlib import Path
@@ -99,10 +100,12 @@ class TestMsgReader:
 
         return str(repo_path), [ts1, ts2, ts3, ts4]
 
-    def test_parse_history(self, tmpdir):
+    def test_parse_history(self, tmpdir, monkeypatch):
         """
         Assert git history is correctly parsed into a commit dictionary.
         """
+        # Write the caches into the temporary directory
+        monkeypatch.chdir(tmpdir)
         repo_path, ts = self.generate_fixtures(tmpdir)
 
         reader = MsgReader(
@@ -150,3 +153,182 @@ class TestMsgReader:
         lang = reader.parse_lang(filename)
 
         assert lang == "en"
+
+    def test_parse_history_since_cache(self, tmpdir, monkeypatch):
+        """
+        Assert the first commit since the latest cache is parsed on the next run.
+        """
+        # Write the caches into the temporary directory
+        monkeypatch.chdir(tmpdir)
+        repo_path, ts = self.generate_fixtures(tmpdir)
+
+        reader = MsgReader(
+            content_paths=["locales"],
+            extensions=[".po"],
+            src_lang="en",
+            repo_path=repo_path,
+            branch="test",
+            use_cache=True,
+        )
+        # Write the cache and commit after it, as git --since compares seconds
+        time.sleep(1)
+        reader.parse_history()
+        time.sleep(1)
+        repo = git.Repo(repo_path)
+        en_file = Path(repo_path) / "locales" / "en" / "messages.po"
+        fr_file = Path(repo_path) / "locales" / "fr" / "messages.po"
+        en_file.write_text(
+            '#Header line.\nmsgid "other msg"\nmsgstr "other msg"', encoding="utf8"
+        )
+        fr_file.write_text(
+            '#Header line.\nmsgid "other msg"\nmsgstr "autre message"',
+            encoding="utf8",
+        )
+        repo.git.add(A=True)
+        repo.git.commit(m="other msg is added")
+        ts5 = float(datetime.timestamp(repo.head.commit.authored_datetime))
+
+        got = reader.parse_history()
+        shutil.rmtree(reader.cache.cache_dir)
+
+        assert got['"new msg"']["fr"]["lt"] == ts[3]
+        assert got['"other msg"']["fr"]["history"] == [(ts5, '"autre message"')]
+
+    def test_history_size(self, tmpdir):
+        """
+        Assert only the latest translations are retained with history_size while
+        the first and last commit timestamps and the latest translation are kept.
+        """
+        repo_path, ts = self.generate_fixtures(tmpdir)
+
+        reader = MsgReader(
+            content_paths=["locales"],
+            extensions=[".po"],
+            src_lang="en",
+            repo_path=repo_path,
+            branch="test",
+            use_cache=False,
+            history_size=2,
+        )
+
+        got = reader.parse_history()
+
+        fr = got['"new msg"']["fr"]
+        assert fr["ft"] == ts[0]
+        assert fr["lt"] == ts[3]
+        assert fr["history"] == [
+            (ts[1], '"nouveau message"'),
+            (ts[2], '""'),
+            (ts[3], '"deleted"'),
+        ]
+
+        # Entries of the same file share one filename object
+        en = got['"new msg"']["en"]
+        assert en["filename"] is reader.get_path(en["filename"])
+
+    def test_pair_modifications(self, tmpdir):
+        """
+        Assert an edited msgid is recorded as a modification of the deleted msgid
+        and keeps its translation history.
+        """
+        repo_path = tmpdir / "msg_modify_repo"
+        repo = git.Repo.init(repo_path)
+        repo.config_writer().set_value("user", "name", "testrumi").release()
+        repo.config_writer().set_value("user", "email", "testrumiemail").release()
+
+        initial_file = repo_path / "initial_file.txt"
+        initial_file.write_text("", encoding="utf8")
+        repo.git.add(A=True)
+        repo.git.commit(m="initial commit")
+        repo.git.branch("test")
+        repo.git.checkout("test")
+
+        (repo_path / "locales" / "en").ensure(dir=True)
+        (repo_path / "locales" / "fr").ensure(dir=True)
+        en_file = repo_path / "locales" / "en" / "messages.po"
+        fr_file = repo_path / "locales" / "fr" / "messages.po"
+
+        commits = [
+            ('"Save your changes"', '"Save your changes"', '""'),
+            ('"Save your changes"', '"Save your changes"', '"Enregistrer"'),
+            ('"Save all your changes"', '"Save all your changes"', '""'),
+        ]
+        ts = []
+        for msgid, en_msgstr, fr_msgstr in commits:
+            en_file.write_text(
+                "#Header line.\nmsgid {}\nmsgstr {}".format(msgid, en_msgstr),
+                encoding="utf8",
+            )
+            fr_file.write_text(
+                "#Header line.\nmsgid {}\nmsgstr {}".format(msgid, fr_msgstr),
+                encoding="utf8",
+            )
+            repo.git.add(A=True)
+            repo.git.commit(m="update {}".format(msgid))
+            ts.append(float(datetime.timestamp(repo.head.commit.authored_datetime)))
+
+        reader = MsgReader(
+            content_paths=["locales"],
+            extensions=[".po"],
+            src_lang="en",
+            repo_path=str(repo_path),
+            branch="test",
+            use_cache=False,
+        )
+        got = reader.parse_history()
+
+        assert list(got.keys()) == ['"Save all your changes"']
+        fr = got['"Save all your changes"']["fr"]
+        assert fr["previous"] == '"Save your changes"'
+        assert fr["ft"] == ts[0]
+        assert fr["history"] == [
+            (ts[0], '""'),
+            (ts[1], '"Enregistrer"'),
+            (ts[2], '""'),
+        ]
+
+        # The old translation is kept with the smallest history_size
+        reader.history_size = 1
+        got = reader.parse_history()
+        fr = got['"Save all your changes"']["fr"]
+        assert fr["history"] == [(ts[1], '"Enregistrer"'), (ts[2], '""')]
+
+        # Pairing can be turned off
+        reader.history_size = None
+        reader.modify_threshold = None
+        got = reader.parse_history()
+        assert set(got.keys()) == {'"Save your changes"', '"Save all your changes"'}
+
+    def test_export_history(self, tmpdir):
+        """
+        Assert the commit history is exported with one row per commit of a message.
+        """
+        pytest.importorskip("numpy")
+        repo_path, ts = self.generate_fixtures(tmpdir)
+
+        reader = MsgReader(
+            content_paths=["locales"],
+            extensions=[".po"],
+            src_lang="en",
+            repo_path=repo_path,
+            branch="test",
+            use_cache=False,
+        )
+        records, tables = reader.export_history(reader.parse_history())
+
+        assert tables["msg"] == ['"new msg"']
+        assert tables["locale"] == ["en", "fr"]
+        assert records.dtype.names == ("msg", "locale", "timestamp", "translation")
+        want = [ts[0], ts[3], ts[0], ts[1], ts[2], ts[3]]
+        assert records["timestamp"].tolist() == want
+
+        codes = records["translation"]
+        translations = [tables["translation"][code] for code in codes]
+        assert translations == [
+            '"new msg"',
+            '"deleted"',
+            '""',
+            '"nouveau message"',
+            '""',
+            '"deleted"',
+        ]
@@ -13,10 +13,13 @@ Test the reporter for message-based translation monitoring
 ##########################################################################
 
 
+import os
 import json
 import pytest
+import zipfile
 
 from rumi.msg_rumi.reporter import MsgReporter
+from rumi.msg_rumi.memory import TranslationMemory
 
 
 ##########################################################################
@@ -44,12 +47,39 @@ class TestMsgReporter:
 
         want_stats = {
             "en": {"total": 2, "open": 0, "updated": 0, "completed": 0},
-            "fr": {"total": 2, "open": 1, "updated": 1, "completed": 0},
-            "ja": {"total": 2, "open": 0, "updated": 1, "completed": 1},
+            "fr": {"total": 1, "open": 1, "updated": 0, "completed": 0},
+            "ja": {"total": 1, "open": 0, "updated": 0, "completed": 1},
         }
 
         assert want_stats == got_stats
 
+    def test_get_status(self):
+        """
+        Assert the status vector of each message follows the order of locales.
+        """
+        reporter = MsgReporter()
+
+        got = reporter.get_status(self.commits, self.src_lang)
+
+        want = {
+            "locales": ["en", "fr", "ja"],
+            "msgs": {"updated_message": (1, "d--"), "message": (1, "soc")},
+        }
+        assert got == want
+
+        # Stats and details can reuse a computed status
+        assert reporter.get_stats({}, self.src_lang, status=got) == reporter.get_stats(
+            self.commits, self.src_lang
+        )
+
+    def test_word_count(self):
+        """
+        Assert words of a message are counted without the quotes.
+        """
+        reporter = MsgReporter()
+        assert reporter.word_count('"Save  all your changes"') == 4
+        assert reporter.word_count('""') == 0
+
     def test_get_details(self):
         """
         Assert details are extracted correctly based on commits and src_lang.
@@ -77,7 +107,7 @@ class TestMsgReporter:
         reporter.print_score(stats)
 
         captured = capsys.readouterr()
-        want = "Translation coverage 25.0%\n"
+        want = "Translation coverage 50.0%\n"
 
         assert captured.out == want
 
@@ -115,6 +145,39 @@ class TestMsgReporter:
 
         assert captured.out == self.details_table
 
+    def test_print_details_top(self, capsys):
+        """
+        Assert only the messages with the most words are printed.
+        """
+        details = {
+            "fr": {"open": 3, "msgs": ['"a"', '"a b c"', '"a b"'], "wc": 6},
+        }
+        reporter = MsgReporter()
+        reporter.print_details(details, top=2)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[1:-1] == ["fr Open: 3", '"a b c"', '"a b"']
+
+    def test_dump_details(self, tmpdir):
+        """
+        Assert the details are written with one row per message of each locale.
+        """
+        reporter = MsgReporter()
+        details = reporter.get_details(self.commits, self.src_lang)
+        filename = reporter.dump_details(details, dump_path=tmpdir)
+
+        with open(filename, "r", encoding="utf-8") as f:
+            got = [json.loads(line) for line in f]
+        assert got == [
+            {"locale": "en", "msg": "message"},
+            {"locale": "fr", "msg": "message"},
+        ]
+
+        stats = reporter.get_stats(self.commits, self.src_lang)
+        filename = reporter.dump_stats(stats, dump_path=tmpdir, format="csv")
+        header = filename.read_text().splitlines()[0]
+        assert header == "locale,total,open,updated,completed"
+
     def test_download_needs(self, tmpdir):
         """
         Assert msg needing translation can be correctly downloaded to specified
@@ -146,3 +209,193 @@ class TestMsgReporter:
         got = tmpdir / "inserted_file.txt"
 
         assert got.read_text(encoding="utf8") == self.new_trans
+
+    def test_download_needs_suggestions(self, tmpdir):
+        """
+        Assert exact matches from the translation memory fill the msgstr and
+        fuzzy matches are written as comments, even with a score of 100%.
+        """
+        commits = {
+            '"Save changes"': {
+                "en": {"ft": 1.0, "lt": 1.0, "history": [(1.0, '"Save changes"')]},
+                "fr": {"ft": 1.0, "lt": 2.0, "history": [(2.0, '"Enregistrer"')]},
+            },
+            '"save changes"': {
+                "en": {"ft": 3.0, "lt": 3.0, "history": [(3.0, '"save changes"')]},
+                "fr": {"ft": 3.0, "lt": 3.0, "history": [(3.0, '""')]},
+            },
+            '"Save all changes"': {
+                "en": {"ft": 3.0, "lt": 3.0, "history": [(3.0, '"Save all"')]},
+                "fr": {"ft": 3.0, "lt": 3.0, "history": [(3.0, '""')]},
+            },
+            # Same shingles as "ha ha", but not an exact match
+            '"ha ha"': {
+                "en": {"ft": 1.0, "lt": 1.0, "history": [(1.0, '"ha ha"')]},
+                "fr": {"ft": 1.0, "lt": 2.0, "history": [(2.0, '"ah ah"')]},
+            },
+            '"ha ha ha ha"': {
+                "en": {"ft": 3.0, "lt": 3.0, "history": [(3.0, '"ha ha ha ha"')]},
+                "fr": {"ft": 3.0, "lt": 3.0, "history": [(3.0, '""')]},
+            },
+            # Translation cleared when the source was saved again
+            '"Cancel"': {
+                "en": {
+                    "ft": 1.0,
+                    "lt": 3.0,
+                    "history": [(1.0, '"Cancel"'), (3.0, '"Cancel"')],
+                },
+                "fr": {
+                    "ft": 1.0,
+                    "lt": 3.0,
+                    "history": [(2.0, '"Annuler"'), (3.0, '""')],
+                },
+            },
+        }
+
+        reporter = MsgReporter()
+        memory = TranslationMemory(commits, self.src_lang)
+        details = reporter.get_details(commits, self.src_lang, memory=memory)
+        reporter.download_needs(details, "fr", path=tmpdir)
+
+        got = (tmpdir / "fr_needing_translation.txt").read_text(encoding="utf8")
+        want = (
+            "Language: fr, 10 words needing translation \n"
+            '# suggestion (100.0%): "Save changes" => "Enregistrer"\n'
+            'msgid "save changes"\n'
+            'msgstr ""\n'
+            "\n"
+            '# suggestion (75.0%): "Save changes" => "Enregistrer"\n'
+            'msgid "Save all changes"\n'
+            'msgstr ""\n'
+            "\n"
+            '# suggestion (100.0%): "ha ha" => "ah ah"\n'
+            'msgid "ha ha ha ha"\n'
+            'msgstr ""\n'
+            "\n"
+            'msgid "Cancel"\n'
+            'msgstr "Annuler"\n'
+            "\n"
+        )
+        assert got == want
+
+    def test_deleted_status(self):
+        """
+        Assert the targets of a message deleted from the source are missing
+        rather than open.
+        """
+        commits = {
+            '"Save changes"': {
+                "en": {
+                    "ft": 1.0,
+                    "lt": 2.0,
+                    "history": [(1.0, '"Save changes"'), (2.0, '"deleted"')],
+                },
+                "fr": {
+                    "ft": 1.0,
+                    "lt": 2.0,
+                    "history": [(1.0, '""'), (2.0, '"deleted"')],
+                },
+            }
+        }
+
+        reporter = MsgReporter()
+        status = reporter.get_status(commits, self.src_lang)
+        assert status["msgs"]['"Save changes"'] == (2, "d-")
+
+        stats = reporter.get_stats(commits, self.src_lang, status=status)
+        assert stats["fr"] == {"total": 0, "open": 0, "updated": 0, "completed": 0}
+
+    def test_modified_status(self):
+        """
+        Assert a modified message with an old translation is "updated" rather
+        than "open".
+        """
+        commits = {
+            '"Save all changes"': {
+                "en": {
+                    "ft": 1.0,
+                    "lt": 3.0,
+                    "history": [(1.0, '"Save changes"'), (3.0, '"Save all changes"')],
+                    "previous": '"Save changes"',
+                },
+                "fr": {
+                    "ft": 1.0,
+                    "lt": 3.0,
+                    "history": [(1.0, '""'), (2.0, '"Enregistrer"'), (3.0, '""')],
+                    "previous": '"Save changes"',
+                },
+            }
+        }
+
+        reporter = MsgReporter()
+        stats = reporter.get_stats(commits, self.src_lang)
+        assert stats["fr"] == {"total": 1, "open": 0, "updated": 1, "completed": 0}
+
+        details = reporter.get_details(commits, self.src_lang)
+        assert details["fr"] == {"open": 0, "msgs": [], "wc": 0}
+
+    def test_download_all_needs(self, tmpdir):
+        """
+        Assert msg needing translation of several languages can be downloaded
+        at once into files or into a single archive.
+        """
+        reporter = MsgReporter()
+        details = reporter.get_details(self.commits, self.src_lang)
+
+        got = reporter.download_all_needs(details, langs=["fr", "ja"], path=tmpdir)
+        assert got == [
+            os.path.join(tmpdir, "fr_needing_translation.txt"),
+            os.path.join(tmpdir, "ja_needing_translation.txt"),
+        ]
+        want = (
+            "Language: fr, 1 words needing translation \n"
+            'msgid message\nmsgstr ""\n\n'
+        )
+        assert (tmpdir / "fr_needing_translation.txt").read_text("utf8") == want
+
+        got = reporter.download_all_needs(details, path=tmpdir, archive="needs.zip")
+        assert got == [os.path.join(tmpdir, "needs.zip")]
+        with zipfile.ZipFile(got[0]) as archive:
+            assert archive.namelist() == [
+                "en_needing_translation.txt",
+                "fr_needing_translation.txt",
+                "ja_needing_translation.txt",
+            ]
+            assert archive.read("fr_needing_translation.txt").decode("utf8") == want
+
+    def test_insert_all_translations(self, tmpdir):
+        """
+        Assert translations of several files are inserted into po files in place.
+        """
+        po_files = []
+        for lang in ["fr", "ja"]:
+            po_file = tmpdir / "{}.po".format(lang)
+            po_file.write_text(self.old_trans, encoding="utf8")
+            po_files.append(str(po_file))
+
+        # The latter file takes precedence for the same msgid
+        add_file = tmpdir / "file.txt"
+        add_file.write_text(self.add_trans, encoding="utf8")
+        old_file = tmpdir / "old.txt"
+        old_file.write_text(
+            'msgid "old translation need to be updated"\nmsgstr "older"\n',
+            encoding="utf8",
+        )
+
+        reporter = MsgReporter()
+        got = reporter.insert_all_translations(
+            {po_files[0]: [str(old_file), str(add_file)], po_files[1]: str(add_file)}
+        )
+
+        assert got == po_files
+        for po_file in po_files:
+            with open(po_file, encoding="utf8") as f:
+                assert f.read() == self.new_trans
+
+        # No temporary or side files are left behind
+        assert sorted(f.basename for f in tmpdir.listdir()) == [
+            "file.txt",
+            "fr.po",
+            "ja.po",
+            "old.txt",
+        ]
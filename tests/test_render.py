@@ -0,0 +1,70 @@
+# tests.test_render
+# Test the fixed-width terminal renderer for the reports
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Test the fixed-width terminal renderer for the reports
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import pytest
+
+from tabulate import tabulate
+from rumi.render import print_table
+
+
+##########################################################################
+# Renderer Test Cases
+##########################################################################
+
+
+class TestRender:
+    @pytest.mark.parametrize(
+        "rows",
+        [
+            [],
+            [["fr", 2, "50.0%"], ["zh-Hans", 10, "0%"]],
+            [["a very long file name.md", 12345, "100.0%"]],
+        ],
+    )
+    def test_print_table(self, capsys, rows):
+        """
+        Assert the table matches the orgtbl format of tabulate.
+        """
+        headers = ["Language", "Total", "Percent"]
+        print_table(iter(rows), headers)
+
+        captured = capsys.readouterr()
+        assert captured.out == tabulate(rows, headers=headers, tablefmt="orgtbl") + "\n"
+
+    def test_numeric(self, capsys):
+        """
+        Assert the alignment of the columns can be fixed instead of inferred.
+        """
+        print_table([[2021, 4]], ["File", "N"], numeric=[False, True])
+        assert capsys.readouterr().out.splitlines()[2] == "| 2021   |   4 |"
+
+    def test_page_size(self, capsys):
+        """
+        Assert each page starts with the header, with the widths of all rows.
+        """
+        rows = [["a", 1], ["b", 22], ["long", 333]]
+        print_table(rows, ["Name", "N"], page_size=2)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines == [
+            "| Name   |   N |",
+            "|--------+-----|",
+            "| a      |   1 |",
+            "| b      |  22 |",
+            "",
+            "| Name   |   N |",
+            "|--------+-----|",
+            "| long   | 333 |",
+        ]
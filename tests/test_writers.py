@@ -0,0 +1,84 @@
+# tests.test_writers
+# Test the streaming JSON Lines and CSV writers for the reports
+#
+# Author: Tianshu Li
+# Created: Oct.19 2026
+
+"""
+Test the streaming JSON Lines and CSV writers for the reports
+"""
+
+##########################################################################
+# Imports
+##########################################################################
+
+
+import csv
+import json
+import pytest
+
+from rumi.writers import stats_rows, write_rows
+
+
+##########################################################################
+# Writers Test Cases
+##########################################################################
+
+
+class TestWriters:
+    def test_write_jsonl(self, tmpdir):
+        """
+        Assert rows are consumed from a generator and written one per line.
+        """
+        rows = ({"msg": "msg{}".format(idx), "wc": idx} for idx in range(3))
+        path = tmpdir / "report.jsonl"
+
+        assert write_rows(rows, path) == 3
+        with open(path, "r", encoding="utf-8") as f:
+            got = [json.loads(line) for line in f]
+        assert got == [{"msg": "msg{}".format(idx), "wc": idx} for idx in range(3)]
+
+    def test_write_csv(self, tmpdir):
+        """
+        Assert the header comes from the first row and nested values are encoded
+        as JSON.
+        """
+        rows = [
+            {"locale": "fr", "msg": "hello", "suggestions": [{"score": 1.0}]},
+            {"locale": "ja", "msg": "翻訳", "suggestions": []},
+        ]
+        path = tmpdir / "report.csv"
+
+        assert write_rows(rows, path, format="csv") == 2
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            got = list(csv.reader(f))
+
+        assert got[0] == ["locale", "msg", "suggestions"]
+        assert got[1][:2] == ["fr", "hello"]
+        assert json.loads(got[1][2]) == [{"score": 1.0}]
+        assert got[2] == ["ja", "翻訳", "[]"]
+
+    def test_write_csv_fields(self, tmpdir):
+        """
+        Assert a report without rows still has the header of the fields.
+        """
+        path = tmpdir / "report.csv"
+        assert write_rows([], path, format="csv", fields=["locale", "msg"]) == 0
+        assert path.read_text("utf-8").splitlines() == ["locale,msg"]
+
+    def test_stats_rows(self):
+        """
+        Assert the stats are flattened into one row per locale.
+        """
+        stats = {"fr": {"total": 2, "open": 1, "updated": 1, "completed": 0}}
+        assert list(stats_rows(stats)) == [
+            {"locale": "fr", "total": 2, "open": 1, "updated": 1, "completed": 0}
+        ]
+
+    def test_format(self, tmpdir):
+        """
+        Assert an unknown format raises an exception without writing a file.
+        """
+        with pytest.raises(Exception, match="Please specify format"):
+            write_rows([], tmpdir / "report.xml", format="xml")
+        assert tmpdir.listdir() == []